@@ -0,0 +1,95 @@
+#  !/usr/bin/env python
+#
+#  LogCtrlBenchmark.py
+#
+#  Copyright (c) 2020 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+
+# stdlib
+import sys
+import time
+
+# 3rd party
+import wx  # type: ignore[import-not-found]
+
+sys.path.append("..")
+
+# this package
+from domdf_wxpython_tools.logctrl import LogCtrl, default_highlight_rules
+
+LINES = 50_000
+BATCH = 1000
+
+sample_lines = [
+		"2020-01-16 16:34:51,123 INFO     Processing sample {}\n",
+		"2020-01-16 16:34:51,456 WARNING  Peak {} is below the threshold\n",
+		"2020-01-16 16:34:52,789 ERROR    Unable to open 'sample_{}.cdf'\n",
+		"2020-01-16 16:34:53,012 DEBUG    Retention time {} = 12.345 min\n",
+		]
+
+
+def benchmark(frame: wx.Frame, **kwargs) -> float:
+	r"""
+	Returns the number of lines per second that can be appended to a :class:`~.LogCtrl`.
+
+	The newly appended text is lexed and styled after each batch, as it would be when the control is displayed.
+
+	:param frame: The frame to create the control in.
+	:param \*\*kwargs: Keyword arguments for :class:`~.LogCtrl`.
+	"""
+
+	log = LogCtrl(frame, **kwargs)
+	log.ClearAll()
+
+	start_time = time.perf_counter()
+
+	for batch_start in range(0, LINES, BATCH):
+		end = log.GetLength()
+		log.writelines(
+				sample_lines[idx % len(sample_lines)].format(idx) for idx in range(batch_start, batch_start + BATCH)
+				)
+		log.flush()
+		log.Colourise(end, -1)
+
+	elapsed = time.perf_counter() - start_time
+	log.Destroy()
+
+	return LINES / elapsed
+
+
+def main() -> None:
+	app = wx.App()
+	frame = wx.Frame(None, size=(800, 600))
+	frame.Show()
+
+	results = [
+			("Python lexer", benchmark(frame, log_mode=False)),
+			("Log mode", benchmark(frame, log_mode=True)),
+			("Log mode with highlighting", benchmark(frame, log_mode=True, highlight_rules=default_highlight_rules)),
+			]
+
+	print(f"Appending {LINES} lines in batches of {BATCH}:")
+	for name, lines_per_second in results:
+		print(f"  {name:<30}{lines_per_second:>12,.0f} lines/s")
+
+	frame.Destroy()
+	app.Destroy()
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,127 @@
+#  !/usr/bin/env python
+#
+#  PanelListCtrlBenchmark.py
+#
+#  Copyright (c) 2020 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+
+# stdlib
+import sys
+import time
+from typing import Callable, Dict, List
+
+# 3rd party
+import wx  # type: ignore[import-not-found]
+
+sys.path.append("..")
+
+# this package
+from domdf_wxpython_tools.panel_listctrl import OwnerDrawnPanelListCtrl, PanelListCtrl, default_css, font_pool
+
+# Appending items one at a time lays out the control after each item,
+# which takes too long to be worth timing for the larger sizes.
+MAX_ONE_AT_A_TIME = 1000
+
+
+def make_text_dicts(count: int) -> List[Dict[str, str]]:
+	"""
+	Returns ``count`` dictionaries of text for the items.
+
+	:param count:
+	"""
+
+	return [{"name": f"Project {idx}", "path": f"/home/user/projects/project_{idx}"} for idx in range(count)]
+
+
+def append_one_at_a_time(list_ctrl: PanelListCtrl, count: int) -> None:
+	for text_dict in make_text_dicts(count):
+		list_ctrl.AppendNewItem(text_dict, default_css)
+
+
+def append_items(list_ctrl: PanelListCtrl, count: int) -> None:
+	list_ctrl.AppendItems(make_text_dicts(count), default_css)
+
+
+def benchmark(frame: wx.Frame, method: Callable[[PanelListCtrl, int], None], count: int) -> float:
+	"""
+	Returns the time taken to populate a :class:`~.PanelListCtrl` with ``count`` items.
+
+	:param frame: The frame to create the control in.
+	:param method: The function used to populate the control.
+	:param count: The number of items.
+	"""
+
+	list_ctrl = PanelListCtrl(frame)
+
+	start_time = time.perf_counter()
+	method(list_ctrl, count)
+	wx.Yield()
+	elapsed = time.perf_counter() - start_time
+
+	list_ctrl.Destroy()
+
+	return elapsed
+
+
+def benchmark_owner_drawn(frame: wx.Frame, count: int) -> float:
+	"""
+	Returns the time taken to create and draw an :class:`~.OwnerDrawnPanelListCtrl` with ``count`` items.
+
+	:param frame: The frame to create the control in.
+	:param count: The number of items.
+	"""
+
+	text_dicts = make_text_dicts(count)
+
+	start_time = time.perf_counter()
+	list_ctrl = OwnerDrawnPanelListCtrl(frame, text_dicts.__getitem__, default_css, item_count=count)
+	list_ctrl.SetSize(frame.GetClientSize())
+	list_ctrl.Update()
+	wx.Yield()
+	elapsed = time.perf_counter() - start_time
+
+	list_ctrl.Destroy()
+
+	return elapsed
+
+
+def main() -> None:
+	app = wx.App()
+	frame = wx.Frame(None, size=(400, 600))
+	frame.Show()
+
+	for count in (1000, 10000):
+		print(f"Populating {count} items:")
+
+		if count <= MAX_ONE_AT_A_TIME:
+			print(f"  {'AppendNewItem':<20}{benchmark(frame, append_one_at_a_time, count):>10.2f} s")
+		else:
+			print(f"  {'AppendNewItem':<20}{'skipped':>10}")
+
+		print(f"  {'AppendItems':<20}{benchmark(frame, append_items, count):>10.2f} s")
+		print(f"  {'OwnerDrawn':<20}{benchmark_owner_drawn(frame, count):>10.2f} s")
+
+	# The number of fonts and colours should not grow with the number of items.
+	print(f"Font pool: {font_pool.stats()}")
+
+	frame.Destroy()
+	app.Destroy()
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,74 @@
+#  !/usr/bin/env python
+#
+#  fixLineEndingsBenchmark.py
+#
+#  Copyright (c) 2020 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+
+# stdlib
+import os
+import sys
+import timeit
+
+sys.path.append("..")
+
+# this package
+from domdf_wxpython_tools.logctrl import LineEndingNormaliser, LogCtrl
+
+CHUNK = "2020-01-16 16:34:51,123 INFO     Processing sample\r\n" * 500 + "Progress: 50%\r" * 100 + "Done\n" * 100
+REPEAT = 2000
+
+
+def old_fix_line_endings(text: str) -> str:
+	"""
+	The original implementation of :meth:`LogCtrl.fixLineEndings <.LogCtrl.fixLineEndings>`.
+
+	:param text:
+	"""
+
+	lines = text.split('\r\n')
+
+	for idx, line in enumerate(lines):
+		chunks = line.split('\r')
+
+		for idx, chunk in enumerate(chunks):
+			chunks[idx] = os.linesep.join(chunk.split('\n'))
+
+		lines[idx] = os.linesep.join(chunks)
+
+	return os.linesep.join(lines)
+
+
+def main() -> None:
+	normaliser = LineEndingNormaliser()
+	chunk_bytes = CHUNK.encode("UTF-8")
+
+	results = [
+			("Original fixLineEndings", timeit.timeit(lambda: old_fix_line_endings(CHUNK), number=REPEAT)),
+			("LogCtrl.fixLineEndings", timeit.timeit(lambda: LogCtrl.fixLineEndings(CHUNK), number=REPEAT)),
+			("LineEndingNormaliser (str)", timeit.timeit(lambda: normaliser.feed(CHUNK), number=REPEAT)),
+			("LineEndingNormaliser (bytes)", timeit.timeit(lambda: normaliser.feed(chunk_bytes), number=REPEAT)),
+			]
+
+	print(f"Normalising {len(CHUNK)} characters {REPEAT} times:")
+	for name, elapsed in results:
+		print(f"  {name:<30}{elapsed * 1000 / REPEAT:>10.3f} ms per chunk")
+
+
+if __name__ == "__main__":
+	main()
@@ -55,7 +55,7 @@ from domdf_wxpython_tools.imagepanel import (
 		)
 from domdf_wxpython_tools.keyboard import gen_keymap, NAVKEYS
 from . import list_dialog  # TODO: list_dialog
-from domdf_wxpython_tools.logctrl import LogCtrl
+from domdf_wxpython_tools.logctrl import LogCtrl, LogCtrlHandler
 from . import panel_listctrl
 from . import picker  # TODO: picker
 from domdf_wxpython_tools.projections import XPanAxes, XPanAxes_NoZoom, NoZoom
@@ -100,6 +100,7 @@ __all__ = [
 		"NAVKEYS",
 		"list_dialog",
 		"LogCtrl",
+		"LogCtrlHandler",
 		"picker",
 		"panel_listctrl",
 		"XPanAxes",
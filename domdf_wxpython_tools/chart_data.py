@@ -0,0 +1,409 @@
+#!/usr/bin/env python
+#
+#  chart_data.py
+"""
+Helpers for displaying large data series in a :class:`~domdf_wxpython_tools.chartpanel.ChartPanelBase`.
+"""
+#
+#  Copyright (c) 2020 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+
+# stdlib
+import threading
+from typing import Any, Callable, List, Optional, Tuple
+
+# 3rd party
+import numpy
+from matplotlib.axes import Axes
+from matplotlib.lines import Line2D
+
+__all__ = ["DecimatedLine", "MinMaxPyramid", "RangeMaxTable", "RingBuffer", "nearest_index"]
+
+
+class MinMaxPyramid:
+	"""
+	Multi-resolution min/max summary of a data series, used to draw the series at about the resolution of the screen.
+
+	Each level of the pyramid divides the series into buckets of ``factor`` times as many points as the level below,
+	and stores the indices of the smallest and largest value in each bucket.
+	Drawing a line through the minimum and maximum of each bucket looks the same as drawing every point,
+	as peaks are never lost.
+
+	The pyramid is built once, so any x-range can be resampled without looking at every point.
+
+	:param x_data: The x values. Must be sorted in ascending order.
+	:param y_data: The y values.
+	:param factor: The number of buckets from each level which are combined into one bucket of the next level.
+	"""
+
+	def __init__(self, x_data: Any, y_data: Any, factor: int = 4):
+		self.x_data = numpy.asarray(x_data)
+		self.y_data = numpy.asarray(y_data)
+
+		if self.x_data.shape != self.y_data.shape or self.x_data.ndim != 1:
+			raise ValueError("'x_data' and 'y_data' must be one dimensional and the same length.")
+
+		if factor < 2:
+			raise ValueError("'factor' must be at least 2.")
+
+		self.factor = factor
+
+		#: The size of the buckets at each level, and the indices of the smallest and largest values in each bucket.
+		self.levels: List[Tuple[int, numpy.ndarray, numpy.ndarray]] = []
+
+		self._build()
+
+	def __len__(self) -> int:
+		return len(self.x_data)
+
+	def _build(self) -> None:
+		index_dtype = numpy.int32 if len(self) < 2**31 else numpy.int64
+
+		bucket_size = self.factor
+		mins = maxs = numpy.arange(len(self), dtype=index_dtype)
+
+		while len(mins) > self.factor:
+			mins = _reduce(self.y_data, mins, self.factor, numpy.argmin)
+			maxs = _reduce(self.y_data, maxs, self.factor, numpy.argmax)
+			self.levels.append((bucket_size, mins, maxs))
+			bucket_size *= self.factor
+
+	def index_range(self, x_min: float, x_max: float) -> Tuple[int, int]:
+		"""
+		Returns the start and end indices of the points between ``x_min`` and ``x_max``.
+
+		One point either side is included so the line continues to the edge of the axes.
+
+		:param x_min:
+		:param x_max:
+		"""
+
+		start = max(int(numpy.searchsorted(self.x_data, x_min, side="left")) - 1, 0)
+		end = min(int(numpy.searchsorted(self.x_data, x_max, side="right")) + 1, len(self))
+
+		return start, end
+
+	def resample(self, x_min: float, x_max: float, n_buckets: int) -> Tuple[numpy.ndarray, numpy.ndarray]:
+		"""
+		Returns the points to draw for the x-range ``x_min`` to ``x_max``.
+
+		If the range contains more than about ``2 * n_buckets`` points, the minimum and maximum of
+		each bucket from the coarsest level with at least ``n_buckets`` buckets in the range are returned.
+
+		:param x_min:
+		:param x_max:
+		:param n_buckets: The number of buckets to divide the range into, usually the width of the axes in pixels.
+
+		:return: The x and y values of the points.
+		"""
+
+		start, end = self.index_range(x_min, x_max)
+
+		level = None
+		for bucket_size, mins, maxs in self.levels:
+			if (end - start) // bucket_size < n_buckets:
+				break
+			level = bucket_size, mins, maxs
+
+		if level is None:
+			return self.x_data[start:end], self.y_data[start:end]
+
+		bucket_size, mins, maxs = level
+		first_bucket = start // bucket_size
+		last_bucket = -(-end // bucket_size)
+
+		bucket_mins = mins[first_bucket:last_bucket]
+		bucket_maxs = maxs[first_bucket:last_bucket]
+
+		# Within each bucket the minimum and maximum are drawn in the order they occur
+		indices = numpy.empty(len(bucket_mins) * 2, dtype=bucket_mins.dtype)
+		indices[0::2] = numpy.minimum(bucket_mins, bucket_maxs)
+		indices[1::2] = numpy.maximum(bucket_mins, bucket_maxs)
+
+		# The first and last buckets may extend beyond the range, but the end points must be included.
+		indices = numpy.concatenate(([start], indices[(indices >= start) & (indices < end)], [end - 1]))
+
+		return self.x_data[indices], self.y_data[indices]
+
+
+def _reduce(
+		y_data: numpy.ndarray,
+		indices: numpy.ndarray,
+		factor: int,
+		arg_func: Callable[..., numpy.ndarray],
+		) -> numpy.ndarray:
+	"""
+	Combine each ``factor`` consecutive buckets into one, keeping the index of the smallest or largest value.
+
+	:param y_data:
+	:param indices: The index of the smallest or largest value in each bucket of the previous level.
+	:param factor:
+	:param arg_func: :func:`numpy.argmin` or :func:`numpy.argmax`.
+	"""
+
+	n_full = len(indices) // factor
+	full = indices[:n_full * factor].reshape(n_full, factor)
+	chosen = full[numpy.arange(n_full), arg_func(y_data[full], axis=1)]
+
+	if n_full * factor < len(indices):
+		tail = indices[n_full * factor:]
+		chosen = numpy.append(chosen, tail[arg_func(y_data[tail])])
+
+	return chosen
+
+
+class DecimatedLine:
+	r"""
+	A line on a matplotlib :class:`~matplotlib.axes.Axes` which only draws as many points as the axes is wide.
+
+	Whenever the x limits of the axes change the data is resampled from a :class:`~.MinMaxPyramid`,
+	so panning and zooming a series of millions of points only draws a few thousand.
+
+	:param ax: The axes to draw the line on.
+	:param x_data: The x values. Must be sorted in ascending order.
+	:param y_data: The y values.
+	:param \*args: Positional arguments passed to :meth:`matplotlib.axes.Axes.plot`, such as a format string.
+	:param \*\*kwargs: Keyword arguments passed to :meth:`matplotlib.axes.Axes.plot`.
+	"""
+
+	#: The line drawn on the axes.
+	line: Line2D
+
+	def __init__(self, ax: Axes, x_data: Any, y_data: Any, *args, **kwargs):
+		self.ax = ax
+		self.pyramid = MinMaxPyramid(x_data, y_data)
+
+		x_min, x_max = self.pyramid.x_data[[0, -1]] if len(self.pyramid) else (0, 0)
+		self.line = ax.plot(*self._resample(x_min, x_max), *args, **kwargs)[0]
+
+		self._xlim_cid: Optional[int] = ax.callbacks.connect("xlim_changed", self.update)
+		self._resize_cid: Optional[int] = ax.figure.canvas.mpl_connect("resize_event", self.update)
+
+	def _resample(self, x_min: float, x_max: float) -> Tuple[numpy.ndarray, numpy.ndarray]:
+		if not len(self.pyramid):
+			return self.pyramid.x_data, self.pyramid.y_data
+
+		n_buckets = max(int(self.ax.bbox.width), 1)
+		return self.pyramid.resample(x_min, x_max, n_buckets)
+
+	def update(self, *_) -> None:  # noqa: PRM002
+		"""
+		Resample the data for the current x limits of the axes.
+		"""
+
+		x_min, x_max = sorted(self.ax.get_xlim())
+		self.line.set_data(*self._resample(x_min, x_max))
+
+	def remove(self) -> None:
+		"""
+		Remove the line from the axes.
+		"""
+
+		if self._xlim_cid is not None:
+			self.ax.callbacks.disconnect(self._xlim_cid)
+			self._xlim_cid = None
+
+		if self._resize_cid is not None:
+			self.ax.figure.canvas.mpl_disconnect(self._resize_cid)
+			self._resize_cid = None
+
+		self.line.remove()
+
+
+class RangeMaxTable:
+	"""
+	Finds the largest value between two indices of an array without looking at every value in between.
+
+	The array is divided into blocks of ``block_size`` values, and a sparse table of the block maxima is built,
+	so a query only looks at two entries of the table and at most ``2 * block_size`` values at the ends of the range.
+	The table takes about ``n / block_size * log2(n / block_size)`` values of memory.
+
+	:param values:
+	:param block_size:
+	"""
+
+	def __init__(self, values: Any, block_size: int = 64):
+		self.values = numpy.asarray(values)
+		self.block_size = block_size
+
+		#: ``table[k][i]`` is the largest value in blocks ``i`` to ``i + 2**k - 1``.
+		self.table: List[numpy.ndarray] = []
+
+		if len(self.values):
+			self.table.append(numpy.maximum.reduceat(self.values, numpy.arange(0, len(self.values), block_size)))
+
+			span = 1
+			while span * 2 <= len(self.table[0]):
+				previous = self.table[-1]
+				self.table.append(numpy.maximum(previous[:-span], previous[span:]))
+				span *= 2
+
+	def __len__(self) -> int:
+		return len(self.values)
+
+	def query(self, start: int, end: int) -> Any:
+		"""
+		Returns the largest value from index ``start`` up to, but not including, index ``end``.
+
+		:param start:
+		:param end:
+		"""
+
+		start, end = int(start), int(end)
+
+		if not 0 <= start < end <= len(self.values):
+			raise IndexError(f"Invalid range {start}:{end} for {len(self.values)} values.")
+
+		block_size = self.block_size
+		first_block = -(-start // block_size)
+		last_block = end // block_size
+
+		if first_block >= last_block:
+			# The range doesn't contain a whole block
+			return self.values[start:end].max()
+
+		level = (last_block - first_block).bit_length() - 1
+		row = self.table[level]
+		result = max(row[first_block], row[last_block - (1 << level)])
+
+		if start < first_block * block_size:
+			result = max(result, self.values[start:first_block * block_size].max())
+		if end > last_block * block_size:
+			result = max(result, self.values[last_block * block_size:end].max())
+
+		return result
+
+
+def nearest_index(sorted_values: numpy.ndarray, value: float) -> int:
+	"""
+	Returns the index of the value in ``sorted_values`` closest to ``value``.
+
+	:param sorted_values: Array of values in ascending order.
+	:param value:
+	"""
+
+	index = int(numpy.searchsorted(sorted_values, value))
+
+	if index == len(sorted_values):
+		return index - 1
+	elif index and value - sorted_values[index - 1] <= sorted_values[index] - value:
+		return index - 1
+	else:
+		return index
+
+
+class RingBuffer:
+	"""
+	Fixed size buffer of x and y values which discards the oldest values when it is full.
+
+	The arrays are allocated once, and values may be added from any thread.
+
+	:param capacity: The maximum number of values to keep.
+	:param dtype: The data type of the values.
+	"""
+
+	def __init__(self, capacity: int, dtype: Any = float):
+		if capacity < 1:
+			raise ValueError("'capacity' must be at least 1.")
+
+		self.capacity = capacity
+		self._x = numpy.empty(capacity, dtype=dtype)
+		self._y = numpy.empty(capacity, dtype=dtype)
+
+		# The index the next value is written to, and the number of values in the buffer
+		self._head = 0
+		self._size = 0
+
+		self._lock = threading.Lock()
+
+	def __len__(self) -> int:
+		return self._size
+
+	def extend(self, x_values: Any, y_values: Any) -> None:
+		"""
+		Add the values to the end of the buffer.
+
+		:param x_values:
+		:param y_values:
+		"""
+
+		x_values = numpy.asarray(x_values, dtype=self._x.dtype).ravel()
+		y_values = numpy.asarray(y_values, dtype=self._y.dtype).ravel()
+
+		if x_values.shape != y_values.shape:
+			raise ValueError("'x_values' and 'y_values' must be the same length.")
+
+		# Only the most recent values fit
+		x_values = x_values[-self.capacity:]
+		y_values = y_values[-self.capacity:]
+		count = len(x_values)
+
+		with self._lock:
+			first = min(count, self.capacity - self._head)
+			self._x[self._head:self._head + first] = x_values[:first]
+			self._y[self._head:self._head + first] = y_values[:first]
+			self._x[:count - first] = x_values[first:]
+			self._y[:count - first] = y_values[first:]
+
+			self._head = (self._head + count) % self.capacity
+			self._size = min(self._size + count, self.capacity)
+
+	def get(self, window: Optional[float] = None) -> Tuple[numpy.ndarray, numpy.ndarray]:
+		"""
+		Returns copies of the x and y values in the buffer, oldest first.
+
+		:param window: If given, only the values whose x value is within ``window`` of the newest x value
+			are returned. This requires the x values to be in ascending order.
+		"""
+
+		with self._lock:
+			if not self._size:
+				return self._x[:0].copy(), self._y[:0].copy()
+
+			start = (self._head - self._size) % self.capacity
+
+			# The values are in at most two runs: from ``start`` to the end of the arrays, then from the start.
+			if start + self._size <= self.capacity:
+				runs = [(start, start + self._size)]
+			else:
+				runs = [(start, self.capacity), (0, self._head)]
+
+			if window is not None:
+				x_min = self._x[(self._head - 1) % self.capacity] - window
+				runs = [
+						(run_start + int(numpy.searchsorted(self._x[run_start:run_end], x_min)), run_end)
+						for run_start, run_end in runs
+						]
+
+			if len(runs) == 1:
+				(run_start, run_end), = runs
+				return self._x[run_start:run_end].copy(), self._y[run_start:run_end].copy()
+
+			return (
+					numpy.concatenate([self._x[run_start:run_end] for run_start, run_end in runs]),
+					numpy.concatenate([self._y[run_start:run_end] for run_start, run_end in runs]),
+					)
+
+	def clear(self) -> None:
+		"""
+		Remove all values from the buffer.
+		"""
+
+		with self._lock:
+			self._head = 0
+			self._size = 0
@@ -33,8 +33,14 @@ A canvas for displaying a chart within a wxPython window.
 #
 
 # stdlib
+import io
+import logging
+import math
+import pickle
+import time
 import types
-from typing import Callable, Optional
+from threading import Condition, Event, Lock, Thread
+from typing import IO, Any, Callable, Dict, Iterable, List, Optional, Tuple, cast
 
 # 3rd party
 import matplotlib
@@ -42,21 +48,67 @@ import matplotlib.projections
 import numpy
 import wx.html2  # type: ignore[import-not-found]
 from matplotlib.axes import Axes
-from matplotlib.backend_bases import MouseEvent
+from matplotlib.backend_bases import DrawEvent, MouseEvent
+from matplotlib.backends.backend_agg import RendererAgg
 from matplotlib.backends.backend_wxagg import FigureCanvasWxAgg as FigureCanvas
 from matplotlib.backends.backend_wxagg import NavigationToolbar2WxAgg as NavigationToolbar
 from matplotlib.figure import Figure
 
 # this package
 from domdf_wxpython_tools.border_config import border_config
+from domdf_wxpython_tools.chart_data import DecimatedLine, RangeMaxTable, RingBuffer, nearest_index
 from domdf_wxpython_tools.projections import XPanAxes
 
-__all__ = ["ChartPanelBase"]
+_logger = logging.getLogger(__name__)
+
+__all__ = ["BackgroundRenderer", "ChartPanelBase", "CursorOverlay", "DataStream", "LinkGroup"]
 
 # Constrain zoom to X axis
 matplotlib.projections.register_projection(XPanAxes)
 
 
+def _default_readout(x: float, y: float) -> str:
+	return f"x = {x:g}, y = {y:g}"
+
+
+class _NavigationToolbar(NavigationToolbar):
+	"""
+	Toolbar which, while panning, only redraws the chart if the mouse movement moved the view.
+
+	Axes with :attr:`~.PreviewPanMixin.fast_pan` enabled ignore most mouse movements while panning,
+	and redraw the chart themselves once they catch up with the mouse.
+	"""
+
+	#: The number of mouse movements while panning.
+	pan_moves: int = 0
+
+	#: The number of redraws caused by mouse movements while panning.
+	pan_redraws: int = 0
+
+	def drag_pan(self, event) -> None:  # noqa: MAN001
+		"""
+		Callback for dragging in pan/zoom mode.
+
+		:param event:
+		"""
+
+		pan_info = getattr(self, "_pan_info", None)
+
+		if pan_info is None or event.buttons != {pan_info.button}:
+			super().drag_pan(event)
+			return
+
+		self.pan_moves += 1
+		view_limits = [(ax.get_xlim(), ax.get_ylim()) for ax in pan_info.axes]
+
+		for ax in pan_info.axes:
+			ax.drag_pan(pan_info.button, event.key, event.x, event.y)
+
+		if view_limits != [(ax.get_xlim(), ax.get_ylim()) for ax in pan_info.axes]:
+			self.pan_redraws += 1
+			self.canvas.draw_idle()
+
+
 class ChartPanelBase(wx.Panel):
 	"""
 	Panel that contains a matplotlib plotting window, used for displaying an image.
@@ -93,23 +145,210 @@ class ChartPanelBase(wx.Panel):
 		self.fig = fig
 		self.ax = ax
 
+		#: Lines added with :meth:`~.ChartPanelBase.plot_decimated`.
+		self.decimated_lines: List[DecimatedLine] = []
+
+		#: Streams added with :meth:`~.ChartPanelBase.add_stream`.
+		self.streams: List["DataStream"] = []
+
+		#: The :class:`~.LinkGroup` the panel belongs to, if any.
+		self.link_group: Optional["LinkGroup"] = None
+
 		self.canvas = FigureCanvas(self, wx.ID_ANY, self.fig)
 		self._do_layout()
 
-		self.toolbar = NavigationToolbar(self.canvas)
+		self.toolbar = _NavigationToolbar(self.canvas)
 		self.toolbar.Hide()
 
+		#: The minimum time, in milliseconds, between redraws requested with :meth:`~.ChartPanelBase.request_draw`.
+		self.frame_budget: float = 1000 / 60
+
+		#: The number of redraws requested with :meth:`~.ChartPanelBase.request_draw`.
+		self.draws_requested: int = 0
+
+		#: The number of redraws actually performed.
+		self.draws_performed: int = 0
+
+		self._last_draw = 0.0
+		self._draw_timer = wx.Timer(self)
+		self._background_renderer: Optional[BackgroundRenderer] = None
+
 		self.Bind(wx.EVT_SIZE, self.on_size_change, self)
 		self.Bind(wx.EVT_MAXIMIZE, self.on_size_change)
+		self.Bind(wx.EVT_TIMER, self._on_draw_timer, self._draw_timer)
+		self.Bind(wx.EVT_WINDOW_DESTROY, self._on_destroy)
+
+	def request_draw(self) -> None:
+		"""
+		Redraw the chart, at most once every :attr:`~.ChartPanelBase.frame_budget` milliseconds.
+
+		If it has already been redrawn within that time it is redrawn once the time has passed.
+
+		Any number of requests within that time result in a single redraw.
+		"""
+
+		self.draws_requested += 1
+
+		if self._draw_timer.IsRunning():
+			return
+
+		delay = self.frame_budget - (time.perf_counter() - self._last_draw) * 1000
+
+		if delay <= 0:
+			self._draw()
+		else:
+			self._draw_timer.StartOnce(math.ceil(delay))
+
+	def _draw(self) -> None:
+		self._last_draw = time.perf_counter()
+		self.draws_performed += 1
+
+		if self.threaded_rendering:
+			self._background_renderer.request()  # type: ignore[union-attr]
+		else:
+			self.canvas.draw_idle()
+
+	@property
+	def threaded_rendering(self) -> bool:
+		"""
+		Whether redraws requested with :meth:`~.ChartPanelBase.request_draw` are rendered on a worker thread.
+
+		This keeps the window responsive while dense figures are drawn.
+
+		See :class:`~.BackgroundRenderer`.
+		"""
+
+		# The thread only stops unexpectedly if something has gone badly wrong,
+		# in which case the chart is drawn on the main thread instead.
+		return self._background_renderer is not None and self._background_renderer.is_alive()
+
+	@threaded_rendering.setter
+	def threaded_rendering(self, enable: bool) -> None:
+		if enable and not self.threaded_rendering:
+			# Replaces a thread which has stopped unexpectedly
+			self._background_renderer = BackgroundRenderer(self.canvas)
+			self._background_renderer.start()
+		elif not enable and self._background_renderer is not None:
+			# Don't wait for a render in progress, which is discarded when it finishes.
+			self._background_renderer.stop()
+			self._background_renderer = None
+
+	def _on_draw_timer(self, _) -> None:  # noqa: PRM002
+		"""
+		Event handler for the redraw timer.
+		"""
+
+		self._draw()
+
+	def _on_destroy(self, event: wx.Event) -> None:  # noqa: PRM002
+		"""
+		Event handler for the panel being destroyed.
+		"""
+
+		if event.GetEventObject() is self:
+			self._draw_timer.Stop()
+			self.threaded_rendering = False
+
+			if self.link_group is not None:
+				self.link_group.remove(self)
+
+		event.Skip()
+
+	def redraw_stats(self) -> Dict[str, int]:
+		"""
+		Returns a dictionary of the number of redraws ``requested`` and ``performed``.
+
+		The number of mouse movements while panning, and the number of redraws they caused,
+		are given as ``pan_moves`` and ``pan_redraws``.
+		"""
+
+		return {
+				"requested": self.draws_requested,
+				"performed": self.draws_performed,
+				"pan_moves": self.toolbar.pan_moves,
+				"pan_redraws": self.toolbar.pan_redraws,
+				}
+
+	def add_cursor_overlay(
+			self,
+			readout: Optional[Callable[[float, float], str]] = _default_readout,
+			**line_kwargs,
+			) -> "CursorOverlay":
+		r"""
+		Show a vertical line and a readout of the coordinates which follow the mouse over the chart.
+
+		See :class:`~.CursorOverlay`.
+
+		:param readout: Function which is given the x and y coordinates of the mouse and returns the text to display.
+			If :py:obj:`None` no readout is shown.
+		:param \*\*line_kwargs: Keyword arguments passed to :meth:`matplotlib.axes.Axes.axvline`.
+		"""
+
+		return CursorOverlay(self.ax, readout, **line_kwargs)
+
+	def plot_decimated(self, x_data: Any, y_data: Any, *args, **kwargs) -> DecimatedLine:
+		r"""
+		Plot a line on the chart, drawing only as many points as the chart is wide.
+
+		The data is resampled whenever the chart is panned, zoomed or resized.
+		Use this rather than :meth:`matplotlib.axes.Axes.plot` for series with millions of points.
+
+		:param x_data: The x values. Must be sorted in ascending order.
+		:param y_data: The y values.
+		:param \*args: Positional arguments passed to :meth:`matplotlib.axes.Axes.plot`, such as a format string.
+		:param \*\*kwargs: Keyword arguments passed to :meth:`matplotlib.axes.Axes.plot`.
+		"""
+
+		line = DecimatedLine(self.ax, x_data, y_data, *args, **kwargs)
+		self.decimated_lines.append(line)
+		return line
+
+	def add_stream(
+			self,
+			capacity: int,
+			*args,
+			window: Optional[float] = None,
+			autoscale_y: bool = True,
+			**kwargs,
+			) -> "DataStream":
+		r"""
+		Add a line to the chart which is fed with live data.
+
+		See :class:`~.DataStream`.
+
+		:param capacity: The maximum number of points to keep. Older points are discarded.
+		:param \*args: Positional arguments passed to :meth:`matplotlib.axes.Axes.plot`, such as a format string.
+		:param window: The width of the visible x-range, which scrolls to follow the newest point.
+			If :py:obj:`None` all points in the stream are shown.
+		:param autoscale_y: Whether to rescale the y-axis to fit the data after each update.
+		:param \*\*kwargs: Keyword arguments passed to :meth:`matplotlib.axes.Axes.plot`.
+		"""
+
+		stream = DataStream(self, capacity, *args, window=window, autoscale_y=autoscale_y, **kwargs)
+		self.streams.append(stream)
+		return stream
 
 	def setup_ylim_refresher(self, y_data, x_data) -> None:
 		"""
 		Setup the function for updating the ylim whenever the xlim changes.
 
+		The largest y value in the visible range is found with a :class:`~.RangeMaxTable`,
+		so updating the ylim doesn't have to look at every point.
+
 		:param y_data:
 		:param x_data:
 		"""
 
+		x_data = numpy.asarray(x_data)
+		y_data = numpy.asarray(y_data)
+
+		if len(x_data) > 1 and (numpy.diff(x_data) < 0).any():
+			order = numpy.argsort(x_data, kind="stable")
+			x_data = x_data[order]
+			y_data = y_data[order]
+
+		y_max_table = RangeMaxTable(y_data)
+
 		def update_ylim(*args) -> None:  # print(str(*args).startswith("MPL MouseEvent")) # Pan
 			assert self.canvas.toolbar is not None
 
@@ -117,18 +356,18 @@ class ChartPanelBase(wx.Panel):
 			active_tool = self.canvas.toolbar._active  # type: ignore[attr-defined]
 			x_pan = str(*args).startswith("XPanAxesSubplot") and active_tool != "PAN"
 			mouse_zoom = str(*args).startswith("MPL MouseEvent") and active_tool != "ZOOM"
-			if x_pan or mouse_zoom:
+			if (x_pan or mouse_zoom) and len(x_data):
 				# print("updated xlims: ", axes.get_xlim())
-				min_x_index = (numpy.abs(x_data - self.ax.get_xlim()[0])).argmin()
-				max_x_index = (numpy.abs(x_data - self.ax.get_xlim()[1])).argmin()
+				min_x_index = nearest_index(x_data, self.ax.get_xlim()[0])
+				max_x_index = nearest_index(x_data, self.ax.get_xlim()[1])
 				# print(min_x_index, max_x_index)
 
-				y_vals_for_range = numpy.take(y_data, [idx for idx in range(min_x_index, max_x_index)])
-				# print(max(y_vals_for_range))
-				self.ax.set_ylim(bottom=0, top=max(y_vals_for_range) * 1.1)
-				self.fig.canvas.draw()
+				if max_x_index <= min_x_index:
+					max_x_index = min_x_index + 1
+
+				self.ax.set_ylim(bottom=0, top=y_max_table.query(min_x_index, max_x_index) * 1.1)
 				# print("x-val: {}, y-val:{}
-				self.size_change()
+				self.request_draw()
 
 		self.ax.callbacks.connect("xlim_changed", update_ylim)
 		self.fig.canvas.callbacks.connect("button_release_event", update_ylim)
@@ -149,7 +388,7 @@ class ChartPanelBase(wx.Panel):
 		assert self.canvas.toolbar is not None
 
 		self.canvas.toolbar.home()
-		self.canvas.draw_idle()
+		self.request_draw()
 
 	def previous_view(self, *_) -> None:  # noqa: PRM002
 		"""
@@ -239,8 +478,7 @@ class ChartPanelBase(wx.Panel):
 		# self.canvas.SetMinSize(self.GetSize())
 		self.canvas.SetSize(self.GetSize())
 		self.Refresh()
-		self.canvas.draw()
-		self.canvas.Refresh()
+		self.request_draw()
 
 		# if event.ClassName == "wxSizeEvent":
 		# 	event.Skip()
@@ -286,7 +524,7 @@ class ChartPanelBase(wx.Panel):
 				# set new limits
 				ax.set_xlim((xdata - cur_xrange * scale_factor, xdata + cur_xrange * scale_factor))
 				ax.set_ylim((ydata - cur_yrange * scale_factor, ydata + cur_yrange * scale_factor))
-				self.canvas.draw()  # force re-draw
+				self.request_draw()
 
 			fig = ax.get_figure()  # get the figure of interest
 			assert fig is not None
@@ -299,3 +537,654 @@ class ChartPanelBase(wx.Panel):
 			return zoom_fun
 
 		self.__zoom_factory = zoom_factory(self.ax, base_scale=scale)
+
+
+class CursorOverlay:
+	r"""
+	A vertical line and a readout of the coordinates which follow the mouse over a matplotlib axes.
+
+	Rather than redrawing the whole figure each time the mouse moves, the figure without the cursor is saved
+	after it is drawn, and on each mouse movement it is restored and only the cursor is drawn over it.
+	The saved figure is discarded when the figure is resized, panned or zoomed,
+	and saved again the next time the figure is drawn.
+
+	:param ax: The axes to display the cursor on.
+	:param readout: Function which is given the x and y coordinates of the mouse and returns the text to display.
+		If :py:obj:`None` no readout is shown.
+	:param \*\*line_kwargs: Keyword arguments passed to :meth:`matplotlib.axes.Axes.axvline`.
+	"""
+
+	def __init__(
+			self,
+			ax: Axes,
+			readout: Optional[Callable[[float, float], str]] = _default_readout,
+			**line_kwargs,
+			):
+
+		self.ax = ax
+		self.canvas = ax.figure.canvas
+		self.readout = readout
+
+		line_kwargs.setdefault("color", "grey")
+		line_kwargs.setdefault("linewidth", 1)
+
+		self.line = ax.axvline(ax.get_xlim()[0], visible=False, animated=True, **line_kwargs)
+		self.text = ax.text(
+				0.01,
+				0.99,
+				'',
+				transform=ax.transAxes,
+				verticalalignment="top",
+				visible=False,
+				animated=True,
+				)
+
+		self._background = None
+
+		self._cids = [
+				self.canvas.mpl_connect("draw_event", self._on_draw),
+				self.canvas.mpl_connect("resize_event", self.invalidate),
+				self.canvas.mpl_connect("motion_notify_event", self._on_motion),
+				self.canvas.mpl_connect("axes_leave_event", self._on_leave),
+				]
+		self._ax_cids = [
+				ax.callbacks.connect("xlim_changed", self.invalidate),
+				ax.callbacks.connect("ylim_changed", self.invalidate),
+				]
+
+	def invalidate(self, *_) -> None:  # noqa: PRM002
+		"""
+		Discard the saved figure, so the cursor isn't drawn over an out of date figure.
+		"""
+
+		self._background = None
+
+	def _on_draw(self, event: DrawEvent) -> None:
+		"""
+		Save the newly drawn figure, and draw the cursor over it.
+
+		:param event:
+		"""
+
+		# The figure may have been drawn into a renderer other than the canvas's, by a BackgroundRenderer.
+		renderer = cast(RendererAgg, event.renderer)
+		self._background = renderer.copy_from_bbox(self.ax.bbox)
+		self._draw_cursor(renderer)
+
+	def _on_motion(self, event: MouseEvent) -> None:
+		"""
+		Move the cursor to the mouse.
+
+		:param event:
+		"""
+
+		if event.inaxes is not self.ax or event.xdata is None or event.ydata is None:
+			return
+
+		self.line.set_xdata([event.xdata, event.xdata])
+		self.line.set_visible(True)
+
+		if self.readout is not None:
+			self.text.set_text(self.readout(event.xdata, event.ydata))
+			self.text.set_visible(True)
+
+		self._blit()
+
+	def _on_leave(self, event: MouseEvent) -> None:
+		"""
+		Hide the cursor when the mouse leaves the axes.
+
+		:param event:
+		"""
+
+		if event.inaxes is self.ax:
+			self.line.set_visible(False)
+			self.text.set_visible(False)
+			self._blit()
+
+	def _draw_cursor(self, renderer: RendererAgg) -> None:
+		self.line.draw(renderer)
+		self.text.draw(renderer)
+
+	def _blit(self) -> None:
+		"""
+		Restore the saved figure and draw the cursor over it.
+		"""
+
+		if self._background is None:
+			# The figure has changed since it was saved, so it must be drawn in full.
+			self.canvas.draw_idle()
+			return
+
+		self.canvas.restore_region(self._background)
+		self._draw_cursor(self.canvas.get_renderer())
+		self.canvas.blit(self.ax.bbox)
+
+	def remove(self) -> None:
+		"""
+		Remove the cursor from the axes.
+		"""
+
+		for cid in self._cids:
+			self.canvas.mpl_disconnect(cid)
+		for cid in self._ax_cids:
+			self.ax.callbacks.disconnect(cid)
+
+		self._cids = []
+		self._ax_cids = []
+
+		self.line.remove()
+		self.text.remove()
+		self.canvas.draw_idle()
+
+
+class DataStream:
+	r"""
+	A line on a :class:`~.ChartPanelBase` which is fed with live data.
+
+	Blocks of points are added with :meth:`~.DataStream.append`, which may be called from any thread.
+	The points are stored in a :class:`~.RingBuffer`, so no memory is allocated as the stream grows.
+	The line is updated in place, at most once per :attr:`~.ChartPanelBase.frame_budget` however often points are added.
+
+	:param panel: The panel to draw the line on.
+	:param capacity: The maximum number of points to keep. Older points are discarded.
+	:param \*args: Positional arguments passed to :meth:`matplotlib.axes.Axes.plot`, such as a format string.
+	:param window: The width of the visible x-range, which scrolls to follow the newest point.
+		If :py:obj:`None` all points in the stream are shown.
+	:param autoscale_y: Whether to rescale the y-axis to fit the data after each update.
+	:param \*\*kwargs: Keyword arguments passed to :meth:`matplotlib.axes.Axes.plot`.
+	"""
+
+	def __init__(
+			self,
+			panel: ChartPanelBase,
+			capacity: int,
+			*args,
+			window: Optional[float] = None,
+			autoscale_y: bool = True,
+			**kwargs,
+			):
+
+		self.panel = panel
+		self.ax = panel.ax
+		self.buffer = RingBuffer(capacity)
+		self.window = window
+		self.autoscale_y = autoscale_y
+
+		self.line, = self.ax.plot([], [], *args, **kwargs)
+
+		#: The number of times the line has been updated.
+		self.updates: int = 0
+
+		self._pending = False
+		self._pending_lock = Lock()
+		self._last_update = 0.0
+
+		# The smallest and largest y values of the visible points
+		self._y_range: Optional[Tuple[float, float]] = None
+
+	def append(self, x_values: Any, y_values: Any) -> None:
+		"""
+		Add points to the end of the stream.
+
+		This may be called from any thread.
+
+		:param x_values: The x values. Must be larger than those already in the stream.
+		:param y_values: The y values.
+		"""
+
+		self.buffer.extend(x_values, y_values)
+
+		with self._pending_lock:
+			if self._pending:
+				# The points will be picked up by the update that is already scheduled.
+				return
+			self._pending = True
+
+		wx.CallAfter(self._schedule_update)
+
+	def clear(self) -> None:
+		"""
+		Remove all points from the stream.
+		"""
+
+		self.buffer.clear()
+		self.update()
+
+	def _schedule_update(self) -> None:
+		delay = self.panel.frame_budget - (time.perf_counter() - self._last_update) * 1000
+
+		if delay <= 0:
+			self.update()
+		else:
+			wx.CallLater(math.ceil(delay), self.update)
+
+	def update(self) -> None:
+		"""
+		Show the points added since the last update.
+
+		Called automatically after :meth:`~.DataStream.append`.
+		"""
+
+		with self._pending_lock:
+			self._pending = False
+
+		if not self.panel:
+			# The panel has been destroyed.
+			return
+
+		self._last_update = time.perf_counter()
+		self.updates += 1
+
+		# Only the points in the visible window are copied out of the buffer.
+		x_data, y_data = self.buffer.get(self.window)
+		self.line.set_data(x_data, y_data)
+
+		if len(x_data):
+			if self.window is not None:
+				self.ax.set_xlim(x_data[-1] - self.window, x_data[-1])
+			elif x_data[-1] > x_data[0]:
+				self.ax.set_xlim(x_data[0], x_data[-1])
+
+			self._y_range = (numpy.nanmin(y_data), numpy.nanmax(y_data))
+		else:
+			self._y_range = None
+
+		if self.autoscale_y:
+			self._autoscale_y()
+
+		self.panel.request_draw()
+
+	def _autoscale_y(self) -> None:
+		"""
+		Fit the y-axis to the visible points of the streams on the same axes.
+		"""
+
+		ranges = [
+				stream._y_range
+				for stream in self.panel.streams
+				if stream.ax is self.ax and stream._y_range is not None
+				]
+
+		if self._y_range is not None and self not in self.panel.streams:
+			ranges.append(self._y_range)
+
+		if not ranges:
+			return
+
+		bottom = min(y_range[0] for y_range in ranges)
+		top = max(y_range[1] for y_range in ranges)
+
+		if not (numpy.isfinite(bottom) and numpy.isfinite(top)):
+			return
+
+		# With no arguments, margins() returns the current margins.
+		x_margin, y_margin = cast(Tuple[float, float], self.ax.margins())
+		margin = (top - bottom) * y_margin
+		if not margin:
+			margin = abs(top) * 0.05 or 1
+
+		self.ax.set_ylim(bottom - margin, top + margin)
+
+	def remove(self) -> None:
+		"""
+		Remove the line from the chart.
+		"""
+
+		self.line.remove()
+
+		if self in self.panel.streams:
+			self.panel.streams.remove(self)
+
+		self.panel.request_draw()
+
+
+class _FigurePickler(pickle.Pickler):
+	"""
+	Pickler which leaves large arrays out of the pickle, so the figure can be copied without copying its data.
+
+	:param file: The file to write the pickle to.
+	:param threshold: Arrays with more than this many values are appended to ``arrays`` rather than pickled.
+	"""
+
+	def __init__(self, file: IO[bytes], threshold: int):
+		super().__init__(file, pickle.HIGHEST_PROTOCOL)
+		self.threshold = threshold
+
+		#: The arrays which were left out of the pickle.
+		self.arrays: List[numpy.ndarray] = []
+
+	def persistent_id(self, obj: Any) -> Optional[int]:
+		if isinstance(obj, numpy.ndarray) and obj.size > self.threshold:
+			self.arrays.append(obj)
+			return len(self.arrays) - 1
+
+		return None
+
+
+class _FigureUnpickler(pickle.Unpickler):
+	"""
+	Unpickler for pickles made by :class:`~._FigurePickler`.
+
+	:param file: The file to read the pickle from.
+	:param arrays: The arrays which were left out of the pickle.
+	"""
+
+	def __init__(self, file: IO[bytes], arrays: List[numpy.ndarray]):
+		super().__init__(file)
+		self.arrays = arrays
+
+	def persistent_load(self, pid: Any) -> numpy.ndarray:
+		return self.arrays[pid]
+
+
+class BackgroundRenderer(Thread):
+	"""
+	Background thread that renders a matplotlib figure and shows the result on its wxPython canvas.
+
+	Each render draws a copy of the figure, made on the main thread when the render starts,
+	so the figure can continue to be changed and drawn on the main thread while it is rendered.
+	To keep copying quick, arrays of more than :attr:`~.BackgroundRenderer.share_threshold` values,
+	such as the data of lines, are shared with the copy rather than copied, and so must not be changed in place.
+	Matplotlib's ``set_data`` methods copy the data they are given, so this only affects code
+	which changes the arrays belonging to an artist directly.
+
+	Rendering requests made while a render is in progress are combined into one, which starts when it finishes.
+	A render which is out of date by the time it finishes is discarded rather than shown,
+	so the canvas only ever shows the figure as it was after the latest request.
+	If the figure cannot be copied it is drawn on the main thread instead.
+
+	``draw_event`` callbacks are called on the main thread when a render is shown.
+
+	:param canvas: The canvas to render.
+	"""
+
+	#: Arrays with more than this many values are shared with the copy of the figure rather than copied.
+	share_threshold: int = 1000
+
+	def __init__(self, canvas: FigureCanvas):
+		self._stopevent = Event()
+		self._condition = Condition()
+		Thread.__init__(self, name="BackgroundRenderer", daemon=True)
+		self.canvas = canvas
+
+		#: The number of renders requested.
+		self.generation: int = 0
+
+		#: The number of renders which were shown on the canvas.
+		self.renders_shown: int = 0
+
+		#: The number of renders which were out of date when they finished, or which failed.
+		self.renders_discarded: int = 0
+
+		# The copy of the figure waiting to be rendered, and whether a render is in progress.
+		self._pending: Optional[Tuple[int, bytes, List[numpy.ndarray], float]] = None
+		self._rendering = False
+		self._copy_failed = False
+
+	def request(self) -> None:
+		"""
+		Render the figure in the background.
+
+		If a render is already in progress the figure is rendered again when it finishes,
+		and the render in progress is discarded.
+
+		This must be called from the main thread.
+		"""
+
+		self.generation += 1
+
+		if not self._rendering:
+			self._start_render()
+
+	def _start_render(self) -> None:
+		"""
+		Copy the figure and pass the copy to the thread to render.
+		"""
+
+		figure = self.canvas.figure
+		buffer = io.BytesIO()
+		pickler = _FigurePickler(buffer, self.share_threshold)
+
+		try:
+			pickler.dump(figure)
+		except Exception:
+			if not self._copy_failed:
+				_logger.exception("Unable to copy the figure; it will be drawn on the main thread instead.")
+				self._copy_failed = True
+
+			self.canvas.draw_idle()
+			return
+
+		self._rendering = True
+
+		with self._condition:
+			self._pending = (self.generation, buffer.getvalue(), pickler.arrays, figure.dpi)
+			self._condition.notify()
+
+	def run(self) -> None:
+		"""
+		Run the renderer thread.
+		"""
+
+		while True:
+			with self._condition:
+				while self._pending is None and not self._stopevent.is_set():
+					self._condition.wait()
+
+				if self._stopevent.is_set():
+					return
+
+				assert self._pending is not None
+				generation, data, arrays, dpi = self._pending
+				self._pending = None
+
+			try:
+				renderer, key = self._render(data, arrays, dpi)
+			except Exception:
+				_logger.exception("Unable to render the figure.")
+				wx.CallAfter(self._show, generation, None, None)
+			else:
+				wx.CallAfter(self._show, generation, renderer, key)
+
+	def _render(
+			self,
+			data: bytes,
+			arrays: List[numpy.ndarray],
+			dpi: float,
+			) -> Tuple[RendererAgg, Tuple[float, float, float]]:
+		"""
+		Draw a copy of the figure into a new renderer.
+
+		Returns the renderer, and the size and dpi of the figure it was drawn at.
+
+		:param data: The pickled figure.
+		:param arrays: The arrays which were left out of the pickle.
+		:param dpi: The dpi of the figure. This isn't pickled on high-DPI displays.
+		"""
+
+		figure = _FigureUnpickler(io.BytesIO(data), arrays).load()
+		if figure.dpi != dpi:
+			figure.dpi = dpi
+
+		width, height = figure.bbox.size
+		key = (width, height, dpi)
+
+		renderer = RendererAgg(width, height, dpi)
+		figure.draw(renderer)
+
+		return renderer, key
+
+	def _show(
+			self,
+			generation: int,
+			renderer: Optional[RendererAgg],
+			key: Optional[Tuple[float, float, float]],
+			) -> None:
+		"""
+		Show the rendered figure on the canvas, and start the next render if one has been requested.
+
+		:param generation: The value of :attr:`~.BackgroundRenderer.generation` when the render started.
+		:param renderer: The renderer the figure was drawn into, or :py:obj:`None` if the render failed.
+		:param key: The size and dpi of the figure when it was drawn.
+		"""
+
+		self._rendering = False
+
+		if self._stopevent.is_set() or not self.canvas:
+			return
+
+		figure = self.canvas.figure
+
+		if renderer is None or generation != self.generation or key != (*figure.bbox.size, figure.dpi):
+			# The render failed, is out of date, or the canvas has been resized since it started.
+			self.renders_discarded += 1
+		else:
+			# The canvas uses the new renderer from now on, e.g. for blitting.
+			self.canvas.renderer = renderer
+			# The key is the figure's size as floats, as in FigureCanvasAgg.get_renderer, despite its annotation.
+			self.canvas._lastKey = cast(Tuple[int, int, float], key)
+			self.canvas.callbacks.process("draw_event", DrawEvent("draw_event", self.canvas, renderer))
+
+			rgba = numpy.asarray(renderer.buffer_rgba())
+			height, width, _ = rgba.shape
+			bitmap = wx.Bitmap.FromBufferRGBA(width, height, rgba)
+
+			if hasattr(self.canvas, "GetDPIScaleFactor"):
+				bitmap.SetScaleFactor(self.canvas.GetDPIScaleFactor())
+
+			self.canvas.bitmap = bitmap
+			self.canvas._isDrawn = True
+			self.canvas.gui_repaint()
+			self.renders_shown += 1
+
+		if generation != self.generation:
+			self._start_render()
+
+	def stop(self) -> None:
+		"""
+		Stop the thread, without waiting for a render in progress to finish.
+		"""
+
+		with self._condition:
+			self._stopevent.set()
+			self._condition.notify()
+
+	def join(self, timeout: Optional[float] = None) -> None:
+		"""
+		Stop the thread and wait for it to end.
+
+		:param timeout: The maximum time to wait, in seconds.
+		"""
+
+		self.stop()
+		Thread.join(self, timeout)
+
+
+class LinkGroup:
+	"""
+	A group of :class:`~.ChartPanelBase` panels which pan and zoom together along the x-axis.
+
+	When the x-limits of one panel change, the new limits are copied to the other panels once the current event
+	has been handled, however many times they changed while handling it.
+	The other panels are then all redrawn together.
+
+	:param panels: The panels to link.
+	"""
+
+	def __init__(self, panels: Iterable[ChartPanelBase] = ()):
+		self.panels: List[ChartPanelBase] = []
+
+		self._cids: Dict[ChartPanelBase, int] = {}
+		self._syncing = False
+		self._pending: Optional[Tuple[ChartPanelBase, Tuple[float, float]]] = None
+
+		for panel in panels:
+			self.add(panel)
+
+	def add(self, panel: ChartPanelBase) -> None:
+		"""
+		Add a panel to the group, removing it from any other group.
+
+		The panel's x-limits are set to those of the other panels in the group.
+
+		:param panel:
+		"""
+
+		if panel in self.panels:
+			return
+
+		if panel.link_group is not None:
+			panel.link_group.remove(panel)
+
+		if self.panels:
+			self._syncing = True
+			try:
+				panel.ax.set_xlim(self.panels[0].ax.get_xlim())
+			finally:
+				self._syncing = False
+			panel.request_draw()
+
+		self.panels.append(panel)
+		panel.link_group = self
+		self._cids[panel] = panel.ax.callbacks.connect("xlim_changed", self._make_callback(panel))
+
+	def _make_callback(self, panel: ChartPanelBase) -> Callable[[Axes], None]:
+
+		def on_xlim_changed(ax: Axes) -> None:
+			if self._syncing:
+				# The change was made by the group.
+				return
+
+			first = self._pending is None
+			self._pending = (panel, ax.get_xlim())
+
+			if first:
+				wx.CallAfter(self._sync)
+
+		return on_xlim_changed
+
+	def remove(self, panel: ChartPanelBase) -> None:
+		"""
+		Remove a panel from the group.
+
+		:param panel:
+		"""
+
+		if panel not in self.panels:
+			return
+
+		self.panels.remove(panel)
+		panel.ax.callbacks.disconnect(self._cids.pop(panel))
+		panel.link_group = None
+
+		if self._pending is not None and self._pending[0] is panel:
+			self._pending = None
+
+	def _sync(self) -> None:
+		"""
+		Copy the latest x-limits to the other panels and redraw them.
+		"""
+
+		if self._pending is None:
+			return
+
+		source, xlim = self._pending
+		self._pending = None
+
+		changed = []
+
+		self._syncing = True
+		try:
+			for panel in self.panels:
+				if panel is source or not panel:
+					continue
+
+				if tuple(panel.ax.get_xlim()) != tuple(xlim):
+					panel.ax.set_xlim(xlim)
+					changed.append(panel)
+		finally:
+			self._syncing = False
+
+		for panel in changed:
+			panel.request_draw()
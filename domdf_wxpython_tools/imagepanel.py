@@ -348,10 +348,7 @@ class ImagePanel(ChartPanelBase):
 		self._load_image()
 		# self.fig.tight_layout()
 		self.fig.subplots_adjust(left=0, bottom=0, top=1, right=1)
-		self.canvas.SetSize(self.GetSize())
-		self.Refresh()
-		self.canvas.draw()
-		self.canvas.Refresh()
+		self.size_change()
 		self.pan(True)
 		# wx.CallAfter(self.pan)
 
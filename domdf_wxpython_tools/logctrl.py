@@ -27,20 +27,53 @@ Log Control, supporting text copying and zoom.
 #
 
 # stdlib
+import bisect
+import codecs
+import collections
 import keyword
+import logging
 import os
+import queue
+import re
+import threading
 import time
-from typing import List, Optional, Tuple
+from collections import OrderedDict
+from typing import (
+		AnyStr,
+		Callable,
+		Deque,
+		Dict,
+		Iterable,
+		Iterator,
+		List,
+		Mapping,
+		Optional,
+		Pattern,
+		Sequence,
+		Set,
+		Tuple,
+		Union,
+		)
 
 # 3rd party
 import wx  # type: ignore[import-not-found]
+from domdf_python_tools.typing import PathLike
 from wx import stc
 
 # this package
 from domdf_wxpython_tools.keyboard import gen_keymap
 from domdf_wxpython_tools.utils import generate_faces
 
-__all__ = ["LogCtrl"]
+__all__ = [
+		"FileFollower",
+		"LineEndingNormaliser",
+		"LogCtrl",
+		"LogCtrlHandler",
+		"LogSearchIndex",
+		"StyleAllocator",
+		"default_highlight_rules",
+		"default_level_colours",
+		]
 
 # IDs
 ID_WRAP = wx.NewIdRef()
@@ -50,6 +83,11 @@ ID_ZOOM_OUT = wx.NewIdRef()
 ID_ZOOM_DEFAULT = wx.NewIdRef()
 ID_ZOOM_SET = wx.NewIdRef()
 
+_logger = logging.getLogger(__name__)
+
+# Indicators 0-7 are reserved for lexers.
+FIND_INDICATOR = 8
+
 # Key bindings:
 # Home              Go to the beginning of the line.
 # Shift+Home        Select to the beginning of the command or line.
@@ -60,7 +98,194 @@ ID_ZOOM_SET = wx.NewIdRef()
 # Ctrl+[            Decrease font size.
 # Ctrl+=            Default font size.
 # Ctrl+F            Search
-# TODO: F3                Search next
+# F3                Search next
+# Shift+F3          Search previous
+
+default_highlight_rules: List[Tuple[Pattern[str], str]] = [
+		# Timestamps
+		(re.compile(r"(?:\d{4}-\d\d-\d\d[ T])?\b\d\d:\d\d:\d\d(?:[.,]\d+)?\b"), "blue"),
+		# Levels
+		(re.compile(r"\bDEBUG\b"), "grey"),
+		(re.compile(r"\bWARN(?:ING)?\b"), "orange"),
+		(re.compile(r"\b(?:ERROR|CRITICAL|FATAL)\b"), "red"),
+		# Tracebacks
+		(re.compile(r"^Traceback \(most recent call last\):|^  File \"[^\r\n]*", re.MULTILINE), "firebrick"),
+		(re.compile(r"^\w+(?:\.\w+)*(?:Error|Exception|Warning)\b[^\r\n]*", re.MULTILINE), "red"),
+		]
+"""
+Example rules for the ``highlight_rules`` argument of :class:`~.LogCtrl`,
+which colour timestamps, logging levels and tracebacks.
+"""
+
+
+class LineEndingNormaliser:
+	r"""
+	Replaces ``\r\n``, ``\r`` and ``\n`` line endings with ``newline`` in a single pass over the text.
+
+	Text may be passed to :meth:`~.LineEndingNormaliser.feed` in chunks, as :class:`str` or :class:`bytes`.
+	A ``\r`` at the end of a chunk is held back until the next chunk,
+	in case the next chunk starts with ``\n``.
+
+	:param newline: The line ending to use.
+	"""
+
+	_str_pattern = re.compile("\r\n?|\n")
+	_bytes_pattern = re.compile(b"\r\n?|\n")
+
+	def __init__(self, newline: str = os.linesep):
+		self.newline: str = newline
+		self._newline_bytes = newline.encode("UTF-8")
+		self._pending_cr = False
+
+	def feed(self, chunk: AnyStr, final: bool = False) -> AnyStr:
+		r"""
+		Returns the chunk with its line endings replaced.
+
+		:param chunk:
+		:param final: If :py:obj:`True`, a ``\r`` at the end of the chunk is not held back.
+		"""
+
+		if isinstance(chunk, bytes):
+			pattern, newline, cr = self._bytes_pattern, self._newline_bytes, b'\r'
+		else:
+			pattern, newline, cr = self._str_pattern, self.newline, '\r'
+
+		if self._pending_cr:
+			chunk = cr + chunk
+			self._pending_cr = False
+
+		if chunk.endswith(cr) and not final:
+			chunk = chunk[:-1]
+			self._pending_cr = True
+
+		if newline == "\n" and cr not in chunk:
+			return chunk
+
+		return pattern.sub(newline, chunk)
+
+	def reset(self) -> None:
+		r"""
+		Discard any ``\r`` held back from the previous chunk.
+		"""
+
+		self._pending_cr = False
+
+
+class StyleAllocator:
+	"""
+	Assigns Scintilla style numbers to text colours.
+
+	Once every style is in use the least recently used style is reassigned to the new colour.
+
+	:param define_style: Function called with the style number and the colour
+		whenever a style is assigned to a colour.
+	:param styles: The style numbers which may be assigned.
+	"""
+
+	#: The number of lookups for colours which already had a style.
+	hits: int
+
+	#: The number of lookups for colours which had to be assigned a style.
+	misses: int
+
+	#: The number of times a style in use was reassigned to a different colour.
+	evictions: int
+
+	def __init__(self, define_style: Callable[[int, str], None], styles: Iterable[int]):
+		self._define_style = define_style
+		self._all_styles = tuple(styles)
+		self._styles: "OrderedDict[str, int]" = OrderedDict()
+		self.reset()
+
+	def reset(self) -> None:
+		"""
+		Forget all assigned styles and reset the counters.
+		"""
+
+		self._styles.clear()
+
+		# Reversed, so the lowest style numbers are popped first.
+		self._free: List[int] = list(reversed(self._all_styles))
+
+		self.hits = 0
+		self.misses = 0
+		self.evictions = 0
+
+	def get_style(self, colour: str) -> int:
+		"""
+		Returns the style number for the given colour, assigning one if necessary.
+
+		:param colour:
+		"""
+
+		styles = self._styles
+
+		try:
+			style = styles[colour]
+		except KeyError:
+			pass
+		else:
+			self.hits += 1
+			styles.move_to_end(colour)
+			return style
+
+		self.misses += 1
+
+		if self._free:
+			style = self._free.pop()
+		else:
+			_, style = styles.popitem(last=False)
+			self.evictions += 1
+
+		styles[colour] = style
+		self._define_style(style, colour)
+
+		return style
+
+	@property
+	def capacity(self) -> int:
+		"""
+		The number of styles which may be assigned.
+		"""
+
+		return len(self._all_styles)
+
+	def stats(self) -> Dict[str, int]:
+		"""
+		Returns the allocator's statistics.
+
+		The dictionary contains the ``hits``, ``misses`` and ``evictions`` counters,
+		and the ``size`` and ``capacity`` of the allocator.
+		"""
+
+		return {
+				"hits": self.hits,
+				"misses": self.misses,
+				"evictions": self.evictions,
+				"size": len(self._styles),
+				"capacity": self.capacity,
+				}
+
+	def __contains__(self, colour: object) -> bool:
+		return colour in self._styles
+
+	def __len__(self) -> int:
+		return len(self._styles)
+
+
+default_level_colours: Dict[int, Optional[str]] = {
+		logging.NOTSET: None,
+		logging.DEBUG: "grey",
+		logging.INFO: None,
+		logging.WARNING: "orange",
+		logging.ERROR: "red",
+		logging.CRITICAL: "firebrick",
+		}
+"""
+The default colours used by :class:`~.LogCtrlHandler` for each logging level.
+
+:py:obj:`None` indicates the default text colour.
+"""
 
 
 class LogCtrl(stc.StyledTextCtrl):
@@ -73,6 +298,24 @@ class LogCtrl(stc.StyledTextCtrl):
 	:param size: The Log window size. The value ::wxDefaultSize indicates a default size, chosen by either the windowing system or wxWidgets, depending on platform.
 	:param style: The window style. See wxPanel.
 	:param name: Window name.
+	:param flush_interval: The maximum time, in milliseconds, between text being passed to
+		:meth:`~.LogCtrl.write` and it being displayed in the control.
+	:param batch_size: The maximum number of chunks of text passed to :meth:`~.LogCtrl.write`
+		that are inserted into the control at once.
+	:param max_lines: The maximum number of lines to keep in the control.
+		If :py:obj:`None` the number of lines is unlimited.
+	:param max_bytes: The maximum size of the text in the control, in bytes.
+		If :py:obj:`None` the size is unlimited.
+	:param spill_file: Optional filename to append lines removed due to ``max_lines`` or ``max_bytes`` to.
+		The removed lines can be searched with :meth:`~.LogCtrl.search_history`.
+	:param log_mode: If :py:obj:`True` the text is not lexed, and is only highlighted using ``highlight_rules``.
+		If :py:obj:`False` the text is highlighted as Python source code, which is considerably slower.
+	:param highlight_rules: A sequence of ``(regular expression, colour)`` tuples.
+		In ``log_mode``, text written with :meth:`~.LogCtrl.write` which matches a regular expression
+		is displayed in the corresponding colour. Only newly appended text is searched.
+		See :py:data:`~.default_highlight_rules` for an example.
+	:param search_trigrams: Whether the :attr:`~.LogCtrl.search_index` should maintain a trigram index,
+		which speeds up searching for text in very large logs at the cost of additional memory.
 	"""
 
 	findDlg: Optional[wx.FindReplaceDialog]
@@ -85,16 +328,93 @@ class LogCtrl(stc.StyledTextCtrl):
 			size: wx.Size = wx.DefaultSize,
 			style: int = wx.CLIP_CHILDREN | wx.SUNKEN_BORDER,
 			name: str = "Log",
+			flush_interval: int = 50,
+			batch_size: int = 1000,
+			max_lines: Optional[int] = None,
+			max_bytes: Optional[int] = None,
+			spill_file: Optional[PathLike] = None,
+			log_mode: bool = True,
+			highlight_rules: Optional[Sequence[Tuple[Union[str, Pattern[str]], str]]] = None,
+			search_trigrams: bool = False,
 			):
 
 		stc.StyledTextCtrl.__init__(self, parent, id, pos, size, style, name)
 
+		#: The maximum time, in milliseconds, between text being written and it being displayed.
+		self.flush_interval: int = flush_interval
+
+		#: The maximum number of chunks of written text inserted into the control at once.
+		self.batch_size: int = batch_size
+
+		# Text written from any thread, waiting to be inserted on the main thread.
+		# deque.append and deque.popleft are atomic, so no lock is required.
+		self._pending: Deque[Tuple[str, Optional[str]]] = collections.deque()
+		self._flush_scheduled = False
+		self._flush_timer = wx.Timer(self)
+
+		# Line endings are normalised on the main thread, so a \r\n split between two writes is handled.
+		self._line_endings = LineEndingNormaliser()
+
+		self._followers: List[FileFollower] = []
+
+		#: The maximum number of lines to keep in the control, or :py:obj:`None` for no limit.
+		self.max_lines: Optional[int] = max_lines
+
+		#: The maximum size of the text in the control in bytes, or :py:obj:`None` for no limit.
+		self.max_bytes: Optional[int] = max_bytes
+
+		#: File that lines removed from the start of the log are appended to.
+		self.spill_file: Optional[PathLike] = spill_file
+
+		#: The number of bytes of removed lines kept in memory before they are written to :attr:`~.LogCtrl.spill_file`.
+		self.spill_batch_size: int = 64 * 1024
+
+		#: The maximum time, in milliseconds, that removed lines are kept in memory before being written to
+		#: :attr:`~.LogCtrl.spill_file`.
+		self.spill_interval: int = 1000
+
+		# Lines removed by _trim_scrollback, waiting to be written to the spill file.
+		self._spill_buffer: List[str] = []
+		self._spill_buffer_size = 0
+		self._spill_timer = wx.Timer(self)
+
+		# Lines from earlier sessions which are already in the spill file are not searched.
+		if spill_file is not None and os.path.isfile(spill_file):
+			self._spill_offset = os.path.getsize(spill_file)
+		else:
+			self._spill_offset = 0
+
+		#: The number of lines that have been removed from the start of the log.
+		self.trimmed_lines: int = 0
+
+		# Set while _trim_scrollback removes lines, which it removes from the search index itself.
+		self._trimming = False
+
+		#: Whether the Python lexer is disabled. See :meth:`~.LogCtrl.SetLogMode`.
+		self.log_mode: bool = log_mode
+
+		#: Regular expressions used to highlight text in ``log_mode``, and the corresponding colours.
+		self.highlight_rules: List[Tuple[Pattern[str], str]] = [
+				(re.compile(pattern), colour) for pattern, colour in (highlight_rules or ())
+				]
+
+		# Style 0 is the default style, and styles between STC_STYLE_DEFAULT
+		# and STC_STYLE_LASTPREDEFINED are used by Scintilla for the margins etc.
+		available_styles = [
+				*range(1, stc.STC_STYLE_DEFAULT),
+				*range(stc.STC_STYLE_LASTPREDEFINED + 1, stc.STC_STYLE_MAX + 1),
+				]
+
+		#: Index of the text in the control, used by :meth:`~.LogCtrl.FindNext` and :meth:`~.LogCtrl.FindAll`.
+		self.search_index = LogSearchIndex(trigrams=search_trigrams)
+
+		#: Assigns styles to the text colours used with :meth:`~.LogCtrl.getStyle`.
+		self.style_allocator = StyleAllocator(self._define_style, available_styles)
+
 		self._FACES = generate_faces()
 		self._keyMap = gen_keymap()
 		self._config()
 		self.default_zoom = self.GetZoom()
-		self._styles: List[Optional[str]] = [None] * 32
-		self._free = 1
 
 		# dispatcher.connect(receiver=self._fontsizer, signal='FontIncrease')
 		# dispatcher.connect(receiver=self._fontsizer, signal='FontDecrease')
@@ -102,10 +422,17 @@ class LogCtrl(stc.StyledTextCtrl):
 
 		self.findDlg = None
 		self.findData = wx.FindReplaceData()
+
+		# The search text and case sensitivity last highlighted by DoFindNext, and the matches.
+		# Cleared whenever the text changes.
+		self._find_cache: Optional[Tuple[Tuple[str, bool], List[Tuple[int, int]]]] = None
 		self.findData.SetFlags(wx.FR_DOWN)
 
 		self.Bind(wx.EVT_CONTEXT_MENU, self.OnContextMenu)
+		self.Bind(wx.EVT_FIND, self.OnFind)
+		self.Bind(wx.EVT_FIND_NEXT, self.OnFind)
 		self.Bind(wx.EVT_FIND_CLOSE, self.OnFindClose)
+		self.Bind(stc.EVT_STC_MODIFIED, self._on_modified)
 		self.Bind(wx.EVT_KEY_DOWN, self.onKeyPress)
 		self.Bind(wx.EVT_MENU, lambda event: self.Copy(), id=wx.ID_COPY)
 		self.Bind(wx.EVT_MENU, lambda event: self.SelectAll(), id=wx.ID_SELECTALL)
@@ -118,6 +445,9 @@ class LogCtrl(stc.StyledTextCtrl):
 		self.Bind(wx.EVT_MENU, self.OnZoomOut, id=ID_ZOOM_OUT)
 		self.Bind(wx.EVT_MENU, self.OnZoomDefault, id=ID_ZOOM_DEFAULT)
 		# TODO: Default Zoom and Set Zoom
+		self.Bind(wx.EVT_TIMER, self._on_flush_timer, self._flush_timer)
+		self.Bind(wx.EVT_TIMER, self._on_spill_timer, self._spill_timer)
+		self.Bind(wx.EVT_WINDOW_DESTROY, self._on_destroy)
 
 		# Display the introductory banner information.
 		self.AppendText("""Click "▶ Run Comparison" to start
@@ -132,12 +462,21 @@ Right click for options
 		self.wrap()
 		self.setDisplayLineNumbers(False)
 
-		self.SetLexer(stc.STC_LEX_PYTHON)
-		self.SetKeyWords(0, ' '.join(keyword.kwlist))
+		self._set_lexer()
 
 		self.setStyles(self._FACES)
 		self.SetViewWhiteSpace(False)
 		self.SetWrapMode(True)
+
+		# The log cannot be edited, and the undo history would otherwise
+		# keep a copy of every line removed by _trim_scrollback.
+		self.SetUndoCollection(False)
+
+		# Only insertions and deletions are needed to update the search index.
+		self.SetModEventMask(stc.STC_MOD_INSERTTEXT | stc.STC_MOD_DELETETEXT)
+
+		self.IndicatorSetStyle(FIND_INDICATOR, stc.STC_INDIC_ROUNDBOX)
+		self.IndicatorSetForeground(FIND_INDICATOR, wx.Colour(255, 165, 0))
 		try:
 			self.SetEndAtLastLine(False)
 		except AttributeError:
@@ -145,6 +484,29 @@ Right click for options
 
 		self.SetMargins(5, 5)
 
+	def _set_lexer(self) -> None:
+		if self.log_mode:
+			# Text is only styled explicitly, when it is appended.
+			self.SetLexer(stc.STC_LEX_NULL)
+		else:
+			self.SetLexer(stc.STC_LEX_PYTHON)
+			self.SetKeyWords(0, ' '.join(keyword.kwlist))
+
+	def SetLogMode(self, log_mode: bool = True) -> None:
+		"""
+		Set whether the text is lexed as Python source code.
+
+		:param log_mode: If :py:obj:`True` the text is not lexed, and is only highlighted using
+			:attr:`~.LogCtrl.highlight_rules` as it is appended.
+			If :py:obj:`False` the text is highlighted as Python source code.
+		"""
+
+		self.log_mode = log_mode
+		self._set_lexer()
+
+		if not log_mode:
+			self.Colourise(0, -1)
+
 	def onKeyPress(self, event: wx.Event) -> None:  # noqa: PRM002
 		"""
 		Event Handler for key being pressed.
@@ -199,6 +561,8 @@ Right click for options
 				"Ctrl+[": self.ZoomOut,  # "ESCAPE": here we should remove focus from the widget,
 				"Ctrl+W": self.ToggleWrap,
 				"Ctrl+L": self.ToggleLineNumbers,
+				"F3": lambda: self.DoFindNext(self.findData, backward=False),
+				"Shift+F3": lambda: self.DoFindNext(self.findData, backward=True),
 				}
 
 		if combination in commands:
@@ -208,24 +572,15 @@ Right click for options
 
 		print(combination)
 
-	def fixLineEndings(self, text: str) -> str:
+	@staticmethod
+	def fixLineEndings(text: str) -> str:
 		"""
 		Return text with line endings replaced by OS-specific endings.
 
 		:param text:
 		"""
 
-		lines = text.split('\r\n')
-
-		for idx, line in enumerate(lines):
-			chunks = line.split('\r')
-
-			for idx, chunk in enumerate(chunks):
-				chunks[idx] = os.linesep.join(chunk.split('\n'))
-
-			lines[idx] = os.linesep.join(chunks)
-
-		return os.linesep.join(lines)
+		return LineEndingNormaliser().feed(text, final=True)
 
 	def setStyles(self, faces) -> None:
 		"""
@@ -266,37 +621,30 @@ Right click for options
 		for style in styles:
 			self.StyleSetSpec(*style)
 
-	def getStyle(self, c: str = "black"):
+		# StyleClearAll has reset the colours of any previously assigned styles.
+		self.style_allocator.reset()
+
+	def getStyle(self, c: str = "black") -> int:
 		"""
 		Returns a style for a given colour if one exists.
 
 		If no style exists for the colour, make a new style.
 
-		If we run out of styles, (only 32 allowed here) we go to the top of the list and reuse previous styles.
+		If we run out of styles the least recently used style is reused.
+		Statistics on style usage are available from :attr:`~.LogCtrl.style_allocator`.
 
 		:param c:
 		"""
 
-		free = self._free
 		if c and isinstance(c, str):
 			c = c.lower()
 		else:
 			c = "black"
 
-		try:
-			style = self._styles.index(c)
-			return style
-
-		except ValueError:
-			style = free
-			self._styles[style] = c
-			self.StyleSetForeground(style, wx.NamedColour(c))
+		return self.style_allocator.get_style(c)
 
-			free += 1
-			if free > 31:
-				free = 0
-			self._free = free
-			return style
+	def _define_style(self, style: int, colour: str) -> None:
+		self.StyleSetForeground(style, wx.NamedColour(colour))
 
 	def OnZoomIn(self, *_) -> None:  # noqa: PRM002
 		"""
@@ -438,36 +786,131 @@ Right click for options
 		# self.EnsureVisible(line)
 		self.GotoLine(line)
 
-	def DoFindNext(self, findData, findDlg=None) -> None:
-		backward = not (findData.GetFlags() & wx.FR_DOWN)
-		matchcase = (findData.GetFlags() & wx.FR_MATCHCASE) != 0
-		end = self.GetLength()
+	def _position_to_line(self, pos: int) -> Tuple[int, int]:
+		"""
+		Returns the :attr:`~.LogCtrl.search_index` line number and the byte offset within that line for the position.
 
-		# Changed to reflect the fact that StyledTextControl is in UTF-8 encoding
-		textstring = self.GetTextRange(0, end).encode("utf-8")
-		findstring = findData.GetFindString().encode("utf-8")
+		:param pos:
+		"""
 
-		if not matchcase:
-			textstring = textstring.lower()
-			findstring = findstring.lower()
-		if backward:
-			start = self.GetSelection()[0]
-			loc = textstring.rfind(findstring, 0, start)
-		else:
-			start = self.GetSelection()[1]
-			loc = textstring.find(findstring, start)
+		line = self.LineFromPosition(pos)
+		return line + self.search_index.first_line, pos - self.PositionFromLine(line)
 
-		# if it wasn't found then restart at begining
-		if loc == -1 and start != 0:
-			if backward:
-				start = end
-				loc = textstring.rfind(findstring, 0, start)
-			else:
-				start = 0
-				loc = textstring.find(findstring, start)
+	def _line_to_position(self, line: int, offset: int) -> int:
+		"""
+		Returns the position of the given :attr:`~.LogCtrl.search_index` line number and byte offset.
+
+		:param line:
+		:param offset:
+		"""
+
+		return self.PositionFromLine(line - self.search_index.first_line) + offset
+
+	def FindNext(
+			self,
+			text: str,
+			regex: bool = False,
+			match_case: bool = False,
+			backward: bool = False,
+			) -> Optional[Tuple[int, int]]:
+		"""
+		Find and select the next occurrence of ``text`` after the selection.
+
+		The search wraps around at the end of the log.
+
+		:param text: The text to search for.
+		:param regex: Whether ``text`` is a regular expression.
+		:param match_case: Whether the search is case sensitive.
+		:param backward: Whether to search backwards from the start of the selection.
+
+		:return: The start and end positions of the match, or :py:obj:`None` if the text was not found.
+		"""
+
+		# Ensure search_index.first_line is up to date.
+		self.search_index.wait()
+
+		anchor, current_pos = self.GetSelection()
+		start_pos = min(anchor, current_pos) if backward else max(anchor, current_pos)
+		line, offset = self._position_to_line(start_pos)
+
+		match = self.search_index.find_next(text, line, offset, regex, match_case, backward)
+		if match is None:
+			return None
+
+		start = self._line_to_position(match[0], match[1])
+		end = start + match[2] - match[1]
+
+		self.ShowPosition(start)
+		self.SetSelection(start, end)
+
+		return start, end
+
+	def FindAll(
+			self,
+			text: str,
+			regex: bool = False,
+			match_case: bool = False,
+			highlight: bool = True,
+			) -> List[Tuple[int, int]]:
+		"""
+		Find all occurrences of ``text`` in the log.
+
+		:param text: The text to search for.
+		:param regex: Whether ``text`` is a regular expression.
+		:param match_case: Whether the search is case sensitive.
+		:param highlight: Whether to highlight the matches, replacing any previous highlights.
+
+		:return: A list of the start and end positions of each match.
+		"""
+
+		matches = []
+
+		for line, start_offset, end_offset in self.search_index.find_all(text, regex, match_case):
+			start = self._line_to_position(line, start_offset)
+			matches.append((start, start + end_offset - start_offset))
+
+		if highlight:
+			self.ClearFindHighlights()
+			for start, end in matches:
+				self.IndicatorFillRange(start, end - start)
+
+		return matches
+
+	def ClearFindHighlights(self) -> None:
+		"""
+		Remove the highlighting added by :meth:`~.LogCtrl.FindAll`.
+		"""
+
+		self._find_cache = None
+		self.SetIndicatorCurrent(FIND_INDICATOR)
+		self.IndicatorClearRange(0, self.GetLength())
+
+	def DoFindNext(self, findData, findDlg=None, backward: Optional[bool] = None) -> None:
+		"""
+		Find and select the next occurrence of the text in ``findData``, and highlight all other occurrences.
+
+		:param findData: The :class:`wx.FindReplaceData` giving the text to search for.
+		:param findDlg: The :class:`wx.FindReplaceDialog`, if any, which is closed if the text is found.
+		:param backward: Whether to search backwards. If :py:obj:`None` the direction from ``findData`` is used.
+		"""
+
+		findstring = findData.GetFindString()
+		if not findstring:
+			return
 
-		# was it still not found?
-		if loc == -1:
+		if backward is None:
+			backward = not (findData.GetFlags() & wx.FR_DOWN)
+		matchcase = (findData.GetFlags() & wx.FR_MATCHCASE) != 0
+
+		# The matches are only highlighted again if the search or the text has changed since last time.
+		key = (findstring, matchcase)
+		if self._find_cache is None or self._find_cache[0] != key:
+			matches = self.FindAll(findstring, match_case=matchcase)
+			self._find_cache = (key, matches)
+
+		match = self.FindNext(findstring, match_case=matchcase, backward=backward)
+
+		if match is None:
 			dlg = wx.MessageDialog(
 					self,
 					"Unable to find the search text.",
@@ -477,16 +920,18 @@ Right click for options
 			dlg.ShowModal()
 			dlg.Destroy()
 
-		if findDlg:
-			if loc == -1:
+			if findDlg:
 				wx.CallAfter(findDlg.SetFocus)
-				return
-			else:
-				findDlg.Close()
 
-		# show and select the found text
-		self.ShowPosition(loc)
-		self.SetSelection(loc, loc + len(findstring))
+		elif findDlg:
+			findDlg.Close()
+
+	def OnFind(self, _) -> None:  # noqa: PRM002
+		"""
+		Event handler for the Find button in the find dialog.
+		"""
+
+		self.DoFindNext(self.findData, self.findDlg)
 
 	def OnFindText(self, *_) -> None:
 		if self.findDlg is not None:
@@ -534,18 +979,377 @@ Right click for options
 			d.ShowModal()
 			d.Destroy()
 
-	def write(self, text: str) -> None:
+	def write(self, text: str, c: Optional[str] = None) -> None:
 		"""
 		Display text in the log.
 
 		Replace line endings with OS-specific endings.
 
+		This method may be called from any thread. The text is buffered and inserted into the control
+		from the main thread, in batches of up to :attr:`~.LogCtrl.batch_size` chunks at most every
+		:attr:`~.LogCtrl.flush_interval` milliseconds.
+
 		:param text:
+		:param c: The text colour. This should be suitable for feeding directly to :class:`wx.NamedColour`.
+			If :py:obj:`None` the default colour is used.
 		"""
 
-		text = self.fixLineEndings(text)
-		self.AddText(text)
-		self.EnsureCaretVisible()
+		self._pending.append((text, c))
+		self._request_flush()
+
+	def writelines(self, lines: Iterable[str]) -> None:
+		"""
+		Display each of the given strings in the log.
+
+		As with :meth:`io.TextIOBase.writelines`, line separators are not added.
+
+		This method may be called from any thread.
+
+		:param lines:
+		"""
+
+		self._pending.extend((line, None) for line in lines)
+		self._request_flush()
+
+	def flush(self) -> None:
+		"""
+		Immediately insert all text passed to :meth:`~.LogCtrl.write` into the control.
+
+		This method must be called from the main thread.
+		"""
+
+		self._flush_timer.Stop()
+		self._flush_pending(len(self._pending))
+
+	def _request_flush(self) -> None:
+		# Called from any thread. A spurious second request just restarts the timer.
+		if not self._flush_scheduled:
+			self._flush_scheduled = True
+			wx.CallAfter(self._start_flush_timer)
+
+	def _start_flush_timer(self) -> None:
+		if self and not self._flush_timer.IsRunning():
+			self._flush_timer.StartOnce(self.flush_interval)
+
+	def _on_flush_timer(self, _) -> None:  # noqa: PRM002
+		"""
+		Event handler for the flush timer.
+		"""
+
+		self._flush_pending(self.batch_size)
+
+	def _on_destroy(self, event: wx.Event) -> None:  # noqa: PRM002
+		"""
+		Event handler for the control being destroyed.
+		"""
+
+		if event.GetEventObject() is self:
+			self._flush_timer.Stop()
+			self._spill_timer.Stop()
+			self.flush_spill()
+			self.search_index.close()
+			self.unfollow()
+
+		event.Skip()
+
+	def _flush_pending(self, limit: int) -> None:
+		"""
+		Insert up to ``limit`` chunks of pending text into the control with a single call to ``AppendText``.
+
+		Consecutive chunks with the same colour are styled with a single ``StartStyling``/``SetStyling`` call.
+
+		:param limit:
+		"""
+
+		# Clear the flag first so text written while we are flushing schedules another flush.
+		self._flush_scheduled = False
+		pending = self._pending
+		chunks = []
+
+		try:
+			for _ in range(limit):
+				chunks.append(pending.popleft())
+		except IndexError:
+			pass
+
+		if chunks:
+			texts = []
+			runs: List[Tuple[int, int, int]] = []
+			styles: Dict[str, int] = {}
+			run_colour: Optional[str] = None
+			run_start = offset = 0
+			normalise = self._line_endings.feed
+
+			for text, colour in chunks:
+				text = normalise(text)
+
+				if colour != run_colour:
+					if run_colour is not None and offset > run_start:
+						runs.append((run_start, offset - run_start, styles[run_colour]))
+					if colour is not None and colour not in styles:
+						styles[colour] = self.getStyle(colour)
+					run_colour, run_start = colour, offset
+
+				texts.append(text)
+				offset += _byte_length(text)
+
+			if run_colour is not None and offset > run_start:
+				runs.append((run_start, offset - run_start, styles[run_colour]))
+
+			self._append_text(''.join(texts), runs)
+
+		if pending:
+			self._flush_scheduled = True
+			self._start_flush_timer()
+
+	def _append_text(self, text: str, styled_runs: Sequence[Tuple[int, int, int]] = ()) -> None:
+		"""
+		Append text to the control, scrolling to the end if the caret was previously there.
+
+		:param text:
+		:param styled_runs: A sequence of ``(offset, length, style)`` tuples giving the style of parts of ``text``.
+			The offset and length are in bytes, with the offset relative to the start of ``text``.
+		"""
+
+		end = self.GetLength()
+		follow = self.GetCurrentPos() == end and self.GetAnchor() == end
+
+		self.AppendText(text)
+
+		if self.log_mode and self.highlight_rules:
+			self._highlight(text, end)
+
+		for offset, length, style in styled_runs:
+			self.StartStyling(end + offset, 0xff)
+			self.SetStyling(length, style)
+
+		self._trim_scrollback()
+
+		if follow:
+			self.GotoPos(self.GetLength())
+
+	def _on_modified(self, event: wx.Event) -> None:  # noqa: PRM002
+		"""
+		Event handler for text being inserted into or deleted from the control, which updates the search index.
+		"""
+
+		mod_type = event.GetModificationType()
+		self._find_cache = None
+
+		if mod_type & stc.STC_MOD_INSERTTEXT:
+			if event.GetPosition() + event.GetLength() == self.GetLength():
+				self.search_index.append(event.GetText())
+			else:
+				self.search_index.reset(self.GetText())
+
+		elif mod_type & stc.STC_MOD_DELETETEXT:
+			# With undo collection off the event doesn't include the deleted text,
+			# so lines removed by _trim_scrollback are removed from the index there.
+			if self._trimming:
+				pass
+			elif not self.GetLength():
+				self.search_index.reset()
+			else:
+				self.search_index.reset(self.GetText())
+
+		event.Skip()
+
+	def _highlight(self, text: str, start: int) -> None:
+		"""
+		Style the parts of ``text`` which match :attr:`~.LogCtrl.highlight_rules`.
+
+		:param text: Text which has just been appended to the control.
+		:param start: The position of the start of ``text`` in the control.
+		"""
+
+		spans = []
+
+		for regex, colour in self.highlight_rules:
+			style = None
+
+			for match in regex.finditer(text):
+				if match.end() > match.start():
+					if style is None:
+						style = self.getStyle(colour)
+					spans.append((match.start(), match.end(), style))
+
+		if not spans:
+			return
+
+		if text.isascii():
+			for span_start, span_end, style in spans:
+				self.StartStyling(start + span_start, 0xff)
+				self.SetStyling(span_end - span_start, style)
+			return
+
+		# Convert character offsets to byte offsets in a single pass over the text.
+		byte_offsets = {}
+		char_offset = byte_offset = 0
+
+		for offset in sorted({offset for span in spans for offset in span[:2]}):
+			byte_offset += _byte_length(text[char_offset:offset])
+			char_offset = offset
+			byte_offsets[offset] = byte_offset
+
+		for span_start, span_end, style in spans:
+			self.StartStyling(start + byte_offsets[span_start], 0xff)
+			self.SetStyling(byte_offsets[span_end] - byte_offsets[span_start], style)
+
+	def _trim_scrollback(self) -> None:
+		"""
+		Remove the oldest lines if the control exceeds :attr:`~.LogCtrl.max_lines` or :attr:`~.LogCtrl.max_bytes`.
+
+		The lines are removed with a single call to ``DeleteRange``,
+		and the scroll position and selection are adjusted to account for them.
+		"""
+
+		first_kept_line = 0
+		line_count = self.GetLineCount()
+
+		if self.max_lines is not None:
+			if not self.GetLineLength(line_count - 1):
+				# Don't count the empty line after a trailing newline.
+				first_kept_line = line_count - 1 - self.max_lines
+			else:
+				first_kept_line = line_count - self.max_lines
+
+		if self.max_bytes is not None and self.GetLength() > self.max_bytes:
+			# Only remove whole lines.
+			position = self.GetLength() - self.max_bytes
+			line = self.LineFromPosition(position)
+			if self.PositionFromLine(line) < position:
+				line += 1
+			first_kept_line = max(first_kept_line, line)
+
+		first_kept_line = min(first_kept_line, line_count - 1)
+		if first_kept_line <= 0:
+			return
+
+		end = self.PositionFromLine(first_kept_line)
+
+		if self.spill_file is not None:
+			removed = self.GetTextRange(0, end)
+			self._spill_buffer.append(removed)
+			self._spill_buffer_size += len(removed.encode("UTF-8"))
+
+			if self._spill_buffer_size >= self.spill_batch_size:
+				self.flush_spill()
+			elif not self._spill_timer.IsRunning():
+				self._spill_timer.StartOnce(self.spill_interval)
+
+		first_visible = self.GetFirstVisibleLine()
+		first_visible_doc_line = self.DocLineFromVisible(first_visible)
+		wrap_offset = first_visible - self.VisibleFromDocLine(first_visible_doc_line)
+		anchor, current_pos = self.GetAnchor(), self.GetCurrentPos()
+
+		self._trimming = True
+		try:
+			self.DeleteRange(0, end)
+		finally:
+			self._trimming = False
+
+		self.search_index.trim(first_kept_line)
+		self.trimmed_lines += first_kept_line
+
+		self.SetAnchor(max(anchor - end, 0))
+		self.SetCurrentPos(max(current_pos - end, 0))
+
+		if first_visible_doc_line >= first_kept_line:
+			self.SetFirstVisibleLine(
+					self.VisibleFromDocLine(first_visible_doc_line - first_kept_line) + wrap_offset,
+					)
+		else:
+			self.SetFirstVisibleLine(0)
+
+	def _on_spill_timer(self, _) -> None:  # noqa: PRM002
+		"""
+		Event handler for the spill timer.
+		"""
+
+		self.flush_spill()
+
+	def flush_spill(self) -> None:
+		"""
+		Write lines removed from the log, which are still held in memory, to :attr:`~.LogCtrl.spill_file`.
+
+		This happens automatically when enough lines have been removed,
+		after :attr:`~.LogCtrl.spill_interval`, and when the control is destroyed.
+		"""
+
+		if not self._spill_buffer or self.spill_file is None:
+			return
+
+		text = ''.join(self._spill_buffer)
+		self._spill_buffer = []
+		self._spill_buffer_size = 0
+
+		with open(self.spill_file, 'a', encoding="UTF-8", newline='') as fp:
+			fp.write(text)
+
+	def search_history(self, pattern: str, flags: int = 0) -> Iterator[Tuple[int, str]]:
+		"""
+		Search the lines removed from the log and saved in :attr:`~.LogCtrl.spill_file`.
+
+		:param pattern: The regular expression to search for.
+		:param flags: Flags to pass to :func:`re.compile`.
+
+		:returns: An iterator of ``(line number, line)`` tuples for lines matching ``pattern``.
+			Line numbers count from the first line ever written to the log.
+			Lines written to the file before the control was created are not searched.
+		"""
+
+		self.flush_spill()
+
+		if self.spill_file is None or not os.path.isfile(self.spill_file):
+			return
+
+		regex = re.compile(pattern, flags)
+
+		with open(self.spill_file, "rb") as fp:
+			fp.seek(self._spill_offset)
+			for line_number, raw_line in enumerate(fp):
+				line = raw_line.decode("UTF-8").rstrip("\r\n")
+				if regex.search(line):
+					yield line_number, line
+
+	def follow(
+			self,
+			filename: PathLike,
+			encoding: str = "UTF-8",
+			from_end: bool = False,
+			poll_interval: float = 0.25,
+			) -> "FileFollower":
+		"""
+		Display the contents of the given file in the log, followed by any text subsequently appended to it.
+
+		The file is read incrementally in a background thread. If the file is truncated it is read again
+		from the start, and if it is replaced (e.g. by log rotation) the new file is read from the start.
+
+		:param filename:
+		:param encoding: The encoding of the file.
+		:param from_end: If :py:obj:`True`, the existing contents of the file are not displayed.
+		:param poll_interval: The time, in seconds, to wait before checking the file for new text.
+
+		:returns: The thread reading the file.
+		"""
+
+		follower = FileFollower(self, filename, encoding, from_end, poll_interval)
+		self._followers.append(follower)
+		follower.start()
+
+		return follower
+
+	def unfollow(self, filename: Optional[PathLike] = None) -> None:
+		"""
+		Stop following a file previously passed to :meth:`~.LogCtrl.follow`.
+
+		:param filename: The file to stop following. If :py:obj:`None` all files are no longer followed.
+		"""
+
+		for follower in self._followers[:]:
+			if filename is None or os.fspath(follower.filename) == os.fspath(filename):
+				follower.join()
+				self._followers.remove(follower)
 
 	def Append(self, text: str, c=None) -> None:
 		"""
@@ -559,8 +1363,9 @@ Right click for options
 		lenText = len(text.encode("utf8"))
 		end = self.GetLength()
 		self.AppendText(text)
-		self.StartStyling(end, 31)
+		self.StartStyling(end, 0xff)
 		self.SetStyling(lenText, style)
+		self._trim_scrollback()
 		self.EnsureCaretVisible()
 
 	def AppendStderr(self, text: str) -> None:
@@ -571,3 +1376,644 @@ Right click for options
 		"""
 
 		self.Append(text, "red")
+
+
+class FileFollower(threading.Thread):
+	"""
+	Background thread which writes text appended to a file to a :class:`~.LogCtrl`.
+
+	New bytes are read from the last offset with :func:`os.pread` where available,
+	and decoded incrementally.
+
+	:param ctrl: The control to write the text to.
+	:param filename:
+	:param encoding: The encoding of the file.
+	:param from_end: If :py:obj:`True`, the existing contents of the file are not written to the control.
+	:param poll_interval: The time, in seconds, to wait before checking the file for new text.
+	"""
+
+	#: The maximum number of bytes read at once.
+	chunk_size: int = 1024 * 1024
+
+	#: Reading pauses while the control has at least this many chunks waiting to be displayed.
+	max_pending: int = 16
+
+	def __init__(
+			self,
+			ctrl: LogCtrl,
+			filename: PathLike,
+			encoding: str = "UTF-8",
+			from_end: bool = False,
+			poll_interval: float = 0.25,
+			):
+
+		self._stopevent = threading.Event()
+		threading.Thread.__init__(self, name=f"FileFollower({os.fspath(filename)!r})", daemon=True)
+
+		self._ctrl = ctrl
+		self.filename: PathLike = filename
+		self.encoding: str = encoding
+		self.from_end: bool = from_end
+		self.poll_interval: float = poll_interval
+
+	def run(self) -> None:
+		"""
+		Run the thread.
+		"""
+
+		fd: Optional[int] = None
+		file_id = None
+		offset = 0
+		decoder = codecs.getincrementaldecoder(self.encoding)(errors="replace")
+		from_end = self.from_end
+
+		try:
+			while not self._stopevent.is_set():
+				if fd is None:
+					try:
+						fd = os.open(self.filename, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+					except FileNotFoundError:
+						self._stopevent.wait(self.poll_interval)
+						continue
+
+					stat = os.fstat(fd)
+					file_id = (stat.st_dev, stat.st_ino)
+					offset = stat.st_size if from_end else 0
+					# Files which replace this one are read from the start.
+					from_end = False
+					decoder.reset()
+
+				size = os.fstat(fd).st_size
+
+				if size < offset:
+					# The file was truncated.
+					offset = 0
+					decoder.reset()
+
+				if size > offset:
+					while len(self._ctrl._pending) >= self.max_pending and not self._stopevent.is_set():
+						self._stopevent.wait(0.01)
+
+					data = _pread(fd, min(self.chunk_size, size - offset), offset)
+					offset += len(data)
+
+					text = decoder.decode(data)
+					if text:
+						self._ctrl.write(text)
+
+					continue
+
+				# At the end of the file; check whether it has been replaced.
+				try:
+					stat = os.stat(self.filename)
+				except FileNotFoundError:
+					pass
+				else:
+					if (stat.st_dev, stat.st_ino) != file_id:
+						os.close(fd)
+						fd = None
+						continue
+
+				self._stopevent.wait(self.poll_interval)
+
+		finally:
+			if fd is not None:
+				os.close(fd)
+
+	def join(self, timeout: Optional[float] = None) -> None:
+		"""
+		Stop the thread and wait for it to end.
+
+		:param timeout:
+		"""
+
+		self._stopevent.set()
+		threading.Thread.join(self, timeout)
+
+
+def _pread(fd: int, length: int, offset: int) -> bytes:
+	"""
+	Read up to ``length`` bytes from the file descriptor, starting at ``offset``.
+
+	:param fd:
+	:param length:
+	:param offset:
+	"""
+
+	if hasattr(os, "pread"):
+		return os.pread(fd, length, offset)
+
+	# Windows
+	os.lseek(fd, offset, os.SEEK_SET)
+	return os.read(fd, length)
+
+
+class LogSearchIndex:
+	"""
+	Index of the text in a :class:`~.LogCtrl`, used to search it quickly.
+
+	The index is updated in a background thread, so :meth:`~.LogSearchIndex.append`,
+	:meth:`~.LogSearchIndex.trim` and :meth:`~.LogSearchIndex.reset` return immediately.
+	Searches wait for any pending updates to be applied.
+
+	Lines are numbered from the first line ever added to the index.
+	:attr:`~.LogSearchIndex.first_line` gives the number of the first line which has not been trimmed.
+
+	Matches are returned as ``(line number, start, end)`` tuples,
+	where ``start`` and ``end`` are byte offsets in the UTF-8 encoded line.
+
+	:param trigrams: Whether to maintain a trigram index, which speeds up searching for plain text
+		of three or more characters at the cost of additional memory and indexing time.
+	"""
+
+	#: The number of lines in each block. Each block is searched with a single regular expression call.
+	block_size: int = 256
+
+	def __init__(self, trigrams: bool = False):
+		#: Whether a trigram index is maintained.
+		self.trigrams: bool = trigrams
+
+		self._closed = False
+		self._lock = threading.RLock()
+		self._queue: "queue.Queue[Optional[Tuple[Callable, object]]]" = queue.Queue()
+		self._reset('')
+
+		self._thread = threading.Thread(target=self._worker, name="LogSearchIndex", daemon=True)
+		self._thread.start()
+
+	# Updates; these may be called from any thread.
+
+	def append(self, text: str) -> None:
+		"""
+		Add text to the end of the index.
+
+		:param text:
+		"""
+
+		self._put(self._append, text)
+
+	def trim(self, lines: int) -> None:
+		"""
+		Remove lines from the start of the index.
+
+		:param lines: The number of lines to remove.
+		"""
+
+		self._put(self._trim, lines)
+
+	def reset(self, text: str = '') -> None:
+		"""
+		Replace the contents of the index.
+
+		:param text: The new text to index.
+		"""
+
+		self._put(self._reset, text)
+
+	def wait(self) -> None:
+		"""
+		Wait for all pending updates to the index to be applied.
+
+		Returns immediately if the background thread has stopped.
+		"""
+
+		queue_ = self._queue
+
+		with queue_.all_tasks_done:
+			while queue_.unfinished_tasks and self._thread.is_alive():
+				queue_.all_tasks_done.wait(0.1)
+
+	def close(self) -> None:
+		"""
+		Stop the background thread. The index cannot be updated afterwards.
+		"""
+
+		self._closed = True
+		self._queue.put(None)
+
+	def _put(self, function: Callable, argument: object) -> None:
+		if not self._closed:
+			self._queue.put((function, argument))
+
+	def _worker(self) -> None:
+		while True:
+			item = self._queue.get()
+
+			try:
+				if item is None:
+					return
+
+				function, argument = item
+				with self._lock:
+					function(argument)
+
+			except Exception:
+				_logger.exception("Unable to update the search index.")
+
+			finally:
+				self._queue.task_done()
+
+	def _reset(self, text: str) -> None:
+		#: The number of the first line in the index.
+		self.first_line: int = 0
+
+		# The line table. Line ``n`` is ``self._lines[n - self._base]``.
+		# Trimmed lines are only removed from the list once they make up half of it.
+		self._lines: List[str] = ['']
+		self._base = 0
+
+		# Cache of the joined text of each block, and the offset of the start of each line within it.
+		self._block_text: Dict[int, Tuple[str, List[int]]] = {}
+
+		# Mapping of lowercase trigrams to the numbers of the complete blocks containing them.
+		self._postings: Dict[str, Set[int]] = {}
+		self._next_unindexed_block = 0
+
+		if text:
+			self._append(text)
+
+	def _append(self, text: str) -> None:
+		lines = self._lines
+		first_changed_line = self._base + len(lines) - 1
+		parts = text.split('\n')
+
+		if len(parts) == 1:
+			lines[-1] += parts[0]
+		else:
+			lines[-1] = _strip_cr(lines[-1] + parts[0])
+			lines.extend(_strip_cr(part) for part in parts[1:-1])
+			lines.append(parts[-1])
+
+		block_size = self.block_size
+		for block in range(first_changed_line // block_size, self.line_count // block_size + 1):
+			self._block_text.pop(block, None)
+
+		if self.trigrams:
+			# Only complete blocks are indexed; the last line may still be appended to.
+			while (self._next_unindexed_block + 1) * block_size < self.line_count:
+				self._index_block(self._next_unindexed_block)
+				self._next_unindexed_block += 1
+
+	def _trim(self, lines: int) -> None:
+		lines = min(lines, self.line_count - self.first_line - 1)
+		if lines <= 0:
+			return
+
+		old_first_block = self.first_line // self.block_size
+		self.first_line += lines
+		first_block = self.first_line // self.block_size
+
+		for block in range(old_first_block, first_block + 1):
+			self._block_text.pop(block, None)
+
+		if self.first_line - self._base > len(self._lines) // 2:
+			del self._lines[:self.first_line - self._base]
+			self._base = self.first_line
+
+		# Purge trimmed blocks from the trigram index once they outnumber the remaining blocks.
+		if self.trigrams and first_block > self._next_unindexed_block - first_block:
+			for trigram, blocks in list(self._postings.items()):
+				live_blocks = {block for block in blocks if block >= first_block}
+				if live_blocks:
+					self._postings[trigram] = live_blocks
+				else:
+					del self._postings[trigram]
+
+	def _index_block(self, block: int) -> None:
+		text = self._get_block(block)[0].lower()
+		postings = self._postings
+
+		for trigram in {text[idx:idx + 3] for idx in range(len(text) - 2)}:
+			if trigram in postings:
+				postings[trigram].add(block)
+			else:
+				postings[trigram] = {block}
+
+	# Queries
+
+	@property
+	def line_count(self) -> int:
+		"""
+		The number of the line after the last line in the index.
+		"""
+
+		return self._base + len(self._lines)
+
+	def get_line(self, line: int) -> str:
+		"""
+		Returns the text of the given line, without the line ending.
+
+		:param line:
+		"""
+
+		if not self.first_line <= line < self.line_count:
+			raise IndexError(f"Line {line} is not in the index.")
+
+		return self._lines[line - self._base]
+
+	def _get_block(self, block: int) -> Tuple[str, List[int]]:
+		"""
+		Returns the text of the untrimmed lines in the given block, and the offset of the start of each line.
+
+		The lines are joined with newlines.
+
+		:param block:
+		"""
+
+		if block in self._block_text:
+			return self._block_text[block]
+
+		start = max(block * self.block_size, self.first_line) - self._base
+		end = min((block + 1) * self.block_size, self.line_count) - self._base
+		lines = self._lines[start:end]
+
+		offsets = []
+		offset = 0
+		for line in lines:
+			offsets.append(offset)
+			offset += len(line) + 1
+
+		self._block_text[block] = cached = ('\n'.join(lines), offsets)
+		return cached
+
+	def _candidate_blocks(self, pattern: str, regex: bool) -> List[int]:
+		"""
+		Returns the numbers of the blocks which may contain matches for ``pattern``, in order.
+
+		:param pattern:
+		:param regex:
+		"""
+
+		first_block = self.first_line // self.block_size
+		all_blocks = range(first_block, (self.line_count - 1) // self.block_size + 1)
+
+		if regex or not self.trigrams or len(pattern) < 3:
+			return list(all_blocks)
+
+		pattern = pattern.lower()
+		trigrams = {pattern[idx:idx + 3] for idx in range(len(pattern) - 2)}
+		postings = sorted((self._postings.get(trigram, set()) for trigram in trigrams), key=len)
+		indexed_blocks = set.intersection(*postings)
+
+		unindexed_blocks = range(max(first_block, self._next_unindexed_block), all_blocks.stop)
+
+		return sorted(block for block in indexed_blocks if block >= first_block) + list(unindexed_blocks)
+
+	def _search_block(self, block: int, compiled: Pattern[str]) -> List[Tuple[int, int, int]]:
+		text, offsets = self._get_block(block)
+		first_line = max(block * self.block_size, self.first_line)
+		matches = []
+
+		for match in compiled.finditer(text):
+			start, end = match.span()
+			if start == end:
+				continue
+
+			line_idx = bisect.bisect_right(offsets, start) - 1
+			line_start = offsets[line_idx]
+			line = self._lines[first_line + line_idx - self._base]
+
+			# Matches spanning multiple lines are truncated to the end of the first line.
+			end = min(end, line_start + len(line))
+			start_byte = _byte_length(line[:start - line_start])
+			end_byte = start_byte + _byte_length(line[start - line_start:end - line_start])
+
+			matches.append((first_line + line_idx, start_byte, end_byte))
+
+		return matches
+
+	def find_all(self, pattern: str, regex: bool = False, match_case: bool = False) -> List[Tuple[int, int, int]]:
+		"""
+		Returns all matches for ``pattern`` in the index.
+
+		:param pattern: The text to search for.
+		:param regex: Whether ``pattern`` is a regular expression.
+		:param match_case: Whether the search is case sensitive.
+		"""
+
+		self.wait()
+
+		with self._lock:
+			compiled = _compile_search(pattern, regex, match_case)
+			matches = []
+
+			for block in self._candidate_blocks(pattern, regex):
+				matches.extend(self._search_block(block, compiled))
+
+			return matches
+
+	def find_next(
+			self,
+			pattern: str,
+			line: int,
+			offset: int,
+			regex: bool = False,
+			match_case: bool = False,
+			backward: bool = False,
+			wrap: bool = True,
+			) -> Optional[Tuple[int, int, int]]:
+		"""
+		Returns the next match for ``pattern`` after the given position, or :py:obj:`None` if there are no matches.
+
+		:param pattern: The text to search for.
+		:param line: The line number to start searching from.
+		:param offset: The byte offset within ``line`` to start searching from.
+		:param regex: Whether ``pattern`` is a regular expression.
+		:param match_case: Whether the search is case sensitive.
+		:param backward: If :py:obj:`True`, returns the last match which ends before the given position instead.
+		:param wrap: Whether to continue the search from the other end of the index if no match is found.
+		"""
+
+		self.wait()
+
+		with self._lock:
+			compiled = _compile_search(pattern, regex, match_case)
+			blocks = self._candidate_blocks(pattern, regex)
+			position = (line, offset)
+			start_block = line // self.block_size
+
+			if backward:
+				for block in reversed(blocks[:bisect.bisect_right(blocks, start_block)]):
+					for match in reversed(self._search_block(block, compiled)):
+						if (match[0], match[2]) <= position:
+							return match
+
+				if wrap:
+					for block in reversed(blocks):
+						matches = self._search_block(block, compiled)
+						if matches:
+							return matches[-1]
+
+			else:
+				for block in blocks[bisect.bisect_left(blocks, start_block):]:
+					for match in self._search_block(block, compiled):
+						if match[:2] >= position:
+							return match
+
+				if wrap:
+					for block in blocks:
+						matches = self._search_block(block, compiled)
+						if matches:
+							return matches[0]
+
+			return None
+
+
+def _strip_cr(line: str) -> str:
+	return line[:-1] if line.endswith('\r') else line
+
+
+def _compile_search(pattern: str, regex: bool, match_case: bool) -> Pattern[str]:
+	"""
+	Compile the given search pattern into a regular expression.
+
+	:param pattern:
+	:param regex: Whether ``pattern`` is already a regular expression.
+	:param match_case: Whether the search is case sensitive.
+	"""
+
+	flags = re.MULTILINE
+	if not match_case:
+		flags |= re.IGNORECASE
+
+	if not regex:
+		pattern = re.escape(pattern)
+
+	return re.compile(pattern, flags)
+
+
+def _byte_length(text: str) -> int:
+	"""
+	Returns the length of ``text`` in the UTF-8 encoding used by the control.
+
+	:param text:
+	"""
+
+	if text.isascii():
+		return len(text)
+	else:
+		return len(text.encode("utf-8"))
+
+
+class LogCtrlHandler(logging.Handler):
+	"""
+	:class:`logging.Handler` that displays log records in a :class:`~.LogCtrl`.
+
+	Records may be emitted from any thread. They are queued, and formatted on a background thread which passes
+	the text to :meth:`LogCtrl.write() <.LogCtrl.write>`, which inserts it into the control from the main thread.
+	As records are formatted after they are emitted, the arguments of a record should not be changed once logged.
+
+	:param ctrl: The control to display the log records in.
+	:param level: The minimum level of records to display.
+	:param colours: Mapping of logging levels to text colours. Records are displayed in the colour of the
+		highest level in the mapping which is less than or equal to the level of the record.
+		Defaults to :py:data:`~.default_level_colours`.
+	"""
+
+	#: The string appended to each formatted record.
+	terminator: str = '\n'
+
+	def __init__(
+			self,
+			ctrl: LogCtrl,
+			level: int = logging.NOTSET,
+			colours: Optional[Mapping[int, Optional[str]]] = None,
+			):
+
+		super().__init__(level)
+
+		self.ctrl = ctrl
+
+		if colours is None:
+			colours = default_level_colours
+
+		self.colours: Dict[int, Optional[str]] = dict(colours)
+		self._levels, self._level_colours = self._make_colour_table(self.colours)
+
+		self._queue: "queue.Queue[Optional[logging.LogRecord]]" = queue.Queue()
+		self._thread = threading.Thread(target=self._worker, name="LogCtrlHandler", daemon=True)
+		self._thread.start()
+
+	@staticmethod
+	def _make_colour_table(colours: Mapping[int, Optional[str]]) -> Tuple[List[int], List[Optional[str]]]:
+		"""
+		Returns the levels in ``colours`` in ascending order, and a list of the corresponding colours.
+
+		:param colours:
+		"""
+
+		levels = sorted(colours)
+		level_colours: List[Optional[str]] = []
+
+		for level in levels:
+			colour = colours[level]
+			if colour is not None:
+				colour = colour.lower()
+			level_colours.append(colour)
+
+		return levels, level_colours
+
+	def get_colour(self, levelno: int) -> Optional[str]:
+		"""
+		Returns the colour used to display records with the given level.
+
+		:param levelno:
+		"""
+
+		index = bisect.bisect_right(self._levels, levelno)
+
+		if index:
+			return self._level_colours[index - 1]
+		else:
+			# The level is below every level in the mapping.
+			return None
+
+	def emit(self, record: logging.LogRecord) -> None:
+		"""
+		Queue the record to be formatted and displayed in the control.
+
+		:param record:
+		"""
+
+		self._queue.put(record)
+
+	def flush(self) -> None:
+		"""
+		Wait for the queued records to be formatted and passed to the control.
+
+		Returns immediately if the background thread has stopped.
+		"""
+
+		queue_ = self._queue
+
+		with queue_.all_tasks_done:
+			while queue_.unfinished_tasks and self._thread.is_alive():
+				queue_.all_tasks_done.wait(0.1)
+
+	def close(self) -> None:
+		"""
+		Format and display the queued records, then stop the background thread.
+		"""
+
+		if self._thread.is_alive():
+			self._queue.put(None)
+			self._thread.join()
+
+		super().close()
+
+	def _worker(self) -> None:
+		while True:
+			record = self._queue.get()
+
+			try:
+				if record is None:
+					return
+
+				try:
+					text = self.format(record) + self.terminator
+					self.ctrl.write(text, self.get_colour(record.levelno))
+				except Exception:
+					self.handleError(record)
+
+			finally:
+				self._queue.task_done()
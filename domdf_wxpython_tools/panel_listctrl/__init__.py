@@ -32,8 +32,21 @@ can be used as the basis for custom list items
 from pathlib import Path
 
 # this package
-from domdf_wxpython_tools.panel_listctrl.css_parser import parse_css, parse_css_file  # noqa: F401
-from domdf_wxpython_tools.panel_listctrl.font_parser import parse_font  # noqa: F401
-from domdf_wxpython_tools.panel_listctrl.panel_listctrl import PanelListCtrl, PanelListItem  # noqa: F401
+from domdf_wxpython_tools.panel_listctrl.css_parser import (  # noqa: F401
+		CompiledStylesheet,
+		StylesheetCache,
+		TextStyle,
+		load_stylesheet,
+		parse_css,
+		parse_css_file,
+		stylesheet_cache,
+		)
+from domdf_wxpython_tools.panel_listctrl.font_parser import FontPool, font_pool, parse_font  # noqa: F401
+from domdf_wxpython_tools.panel_listctrl.panel_listctrl import (  # noqa: F401
+		OwnerDrawnPanelListCtrl,
+		PanelListCtrl,
+		PanelListItem,
+		VirtualPanelListCtrl,
+		)
 
 default_css = Path(__file__).parent / "Default.css"
@@ -23,18 +23,31 @@
 #
 
 # stdlib
-from typing import Dict
+import hashlib
+import os
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterator, Mapping, Optional, Tuple, Union
 
 # 3rd party
 import tinycss  # type: ignore[import-untyped]
 import webcolors
 import wx  # type: ignore[import-not-found]
+from cawdrey import frozendict
 from domdf_python_tools.typing import PathLike
 
 # this package
 from domdf_wxpython_tools.panel_listctrl.constants import sys_colour_lookup, text_defaults
-
-__all__ = ["parse_css_file", "parse_css"]
+from domdf_wxpython_tools.panel_listctrl.font_parser import font_pool, parse_font
+
+__all__ = [
+		"parse_css_file",
+		"parse_css",
+		"CompiledStylesheet",
+		"StylesheetCache",
+		"TextStyle",
+		"load_stylesheet",
+		"stylesheet_cache",
+		]
 
 # Setup tinycss
 parser = tinycss.make_parser("page3")
@@ -154,36 +167,272 @@ See https://wxpython.org/Phoenix/docs/html/wx.SystemColour.enumeration.html for
 
 			styles[rule.selector.as_css()][name] = value
 
-	# if li p is not styled, use the default values
-	if "li p" not in styles:
-		styles["li p"] = text_defaults.copy()
-
-	# If li p is missing any parameters, add them from the default values
-	styles["li p"] = {**text_defaults, **styles["li p"]}
-
-	# if li p::selection is not styled, use the values from p
-	if "li p::selection" not in styles:
-		styles["li p::selection"] = styles["li p"].copy()
-
-	# If li p is missing any parameters, add them from p
-	styles["li p::selection"] = {**styles["li p"], **styles["li p::selection"]}
-
-	# For each li p class, add undefined values from p
-	for style in styles:
-		if style.split('.')[0] == "li p":
-			if style == "li p":
-				continue
-			if "::selection" in style:
-				continue
-			styles[style] = {**styles["li p"], **styles[style]}
-
-	# For each p::selection class, add undefined values from p::selection
-	for style in styles:
-		if style.split('.')[0] == "li p":
-			if style == "li p::selection":
-				continue
-			if "::selection" not in style:
-				continue
-			styles[style] = {**styles["li p::selection"], **styles[style]}
+	# li p inherits from the default values, and li p::selection from li p
+	base = styles["li p"] = {**text_defaults, **styles.get("li p", {})}
+	selection = styles["li p::selection"] = {**base, **styles.get("li p::selection", {})}
+
+	# Each li p class inherits from li p, and each li p class ::selection from li p::selection
+	for selector, declarations in styles.items():
+		if selector.split('.')[0] != "li p" or selector == "li p":
+			continue
+
+		if "::selection" in selector:
+			styles[selector] = {**selection, **declarations}
+		else:
+			styles[selector] = {**base, **declarations}
 
 	return styles
+
+
+class TextStyle:
+	"""
+	The colour and font for text with a particular css class.
+
+	:param colour:
+	:param font:
+	"""
+
+	__slots__ = ("colour", "font")
+
+	def __init__(self, colour: wx.Colour, font: wx.Font):
+		self.colour = colour
+		self.font = font
+
+	@classmethod
+	def from_declarations(cls, declarations: Mapping[str, Any]) -> "TextStyle":
+		"""
+		Create a :class:`~.TextStyle` from the resolved declarations for a ``li p`` selector.
+
+		:param declarations:
+		"""
+
+		colour, font_data = parse_font(declarations)
+		return cls(font_pool.get_colour(colour), font_pool.get_font(font_data))
+
+
+class CompiledStylesheet(Mapping[str, Mapping[str, Any]]):
+	"""
+	A parsed stylesheet which also provides ready-made colours and fonts for each selector.
+
+	The colours and fonts are taken from :data:`~.font_pool` the first time they are requested, and then reused.
+	The stylesheet can also be used as a mapping of selectors to properties.
+
+	:param styles: The parsed stylesheet.
+	"""
+
+	__slots__ = ("_styles", "_text_styles", "_backgrounds")
+
+	def __init__(self, styles: Mapping[str, Mapping[str, Any]]):
+		self._styles = styles
+		self._text_styles: Dict[Tuple[str, bool], TextStyle] = {}
+		self._backgrounds: Dict[bool, Optional[wx.Colour]] = {}
+
+	def text_style(self, css_class: str, selected: bool = False) -> TextStyle:
+		"""
+		Returns the colour and font for text with the given css class.
+
+		If the stylesheet has no style for the class the style for ``li p`` is used.
+
+		:param css_class:
+		:param selected: Whether to return the style for when the item is selected.
+		"""
+
+		key = (css_class, selected)
+
+		try:
+			return self._text_styles[key]
+		except KeyError:
+			pass
+
+		if selected:
+			declarations = self._styles.get(f"li p.{css_class}::selection", self._styles["li p::selection"])
+		else:
+			declarations = self._styles.get(f"li p.{css_class}", self._styles["li p"])
+
+		text_style = self._text_styles[key] = TextStyle.from_declarations(declarations)
+		return text_style
+
+	def background_colour(self, selected: bool = False) -> Optional[wx.Colour]:
+		"""
+		Returns the background colour for items, or :py:obj:`None` if the stylesheet doesn't specify one.
+
+		:param selected: Whether to return the background colour for when the item is selected.
+		"""
+
+		try:
+			return self._backgrounds[selected]
+		except KeyError:
+			pass
+
+		declarations = self._styles.get("li::selection" if selected else "li", {})
+
+		if "background-color" in declarations:
+			colour = font_pool.get_colour(declarations["background-color"])
+		else:
+			colour = None
+
+		self._backgrounds[selected] = colour
+		return colour
+
+	def __getitem__(self, selector: str) -> Mapping[str, Any]:
+		return self._styles[selector]
+
+	def __iter__(self) -> Iterator[str]:
+		return iter(self._styles)
+
+	def __len__(self) -> int:
+		return len(self._styles)
+
+
+def _compile(styles: Dict) -> CompiledStylesheet:
+	return CompiledStylesheet(
+			frozendict({selector: frozendict(declarations) for selector, declarations in styles.items()}),
+			)
+
+
+class StylesheetCache:
+	"""
+	Cache of parsed stylesheets.
+
+	Stylesheets in files are keyed by their path, modification time and size,
+	so the file is parsed again if it changes on disk.
+	Stylesheets given as strings are keyed by a hash of their contents.
+
+	Once the cache is full the least recently used stylesheet is discarded.
+
+	:param maxsize: The maximum number of stylesheets to keep.
+	"""
+
+	#: The number of lookups for stylesheets which were already parsed.
+	hits: int
+
+	#: The number of lookups for stylesheets which had to be parsed.
+	misses: int
+
+	def __init__(self, maxsize: int = 32):
+		self.maxsize = maxsize
+		self._cache: "OrderedDict[Hashable, CompiledStylesheet]" = OrderedDict()
+		self.clear()
+
+	def clear(self) -> None:
+		"""
+		Remove all stylesheets from the cache and reset the counters.
+		"""
+
+		self._cache.clear()
+		self.hits = 0
+		self.misses = 0
+
+	def get(self, style_data: Union[str, PathLike]) -> CompiledStylesheet:
+		"""
+		Returns the parsed stylesheet for the given css string or filename.
+
+		Strings are treated as filenames if a file with that name exists, and as css otherwise.
+		If a string cannot be parsed as css it is treated as a filename.
+
+		:param style_data:
+
+		:return: The parsed stylesheet, which is shared with other callers and must not be modified.
+		"""
+
+		if not isinstance(style_data, str) or _is_file(style_data):
+			return self.get_file(style_data)
+
+		key = ("css", hashlib.sha1(style_data.encode("UTF-8")).hexdigest())  # nosec: B303
+
+		cached = self._lookup(key)
+		if cached is not None:
+			return cached
+
+		try:
+			styles = parse_css(style_data)
+		except ValueError:
+			return self.get_file(style_data)
+
+		return self._store(key, styles)
+
+	def get_file(self, filename: PathLike) -> CompiledStylesheet:
+		"""
+		Returns the parsed stylesheet in the given file.
+
+		:param filename:
+
+		:return: The parsed stylesheet, which is shared with other callers and must not be modified.
+		"""
+
+		try:
+			stat = os.stat(filename)
+		except OSError:
+			# Let tinycss report the missing file
+			return _compile(parse_css_file(filename))
+
+		key = ("file", os.path.abspath(filename), stat.st_mtime_ns, stat.st_size)
+
+		cached = self._lookup(key)
+		if cached is not None:
+			return cached
+
+		return self._store(key, parse_css_file(filename))
+
+	def _lookup(self, key: Hashable) -> Union[CompiledStylesheet, None]:
+		try:
+			styles = self._cache[key]
+		except KeyError:
+			return None
+
+		self.hits += 1
+		self._cache.move_to_end(key)
+		return styles
+
+	def _store(self, key: Hashable, styles: Dict) -> CompiledStylesheet:
+		self.misses += 1
+
+		compiled = self._cache[key] = _compile(styles)
+
+		while len(self._cache) > self.maxsize:
+			self._cache.popitem(last=False)
+
+		return compiled
+
+	def stats(self) -> Dict[str, int]:
+		"""
+		Returns the cache's statistics.
+
+		The dictionary contains the ``hits`` and ``misses`` counters,
+		and the ``size`` and ``maxsize`` of the cache.
+		"""
+
+		return {
+				"hits": self.hits,
+				"misses": self.misses,
+				"size": len(self._cache),
+				"maxsize": self.maxsize,
+				}
+
+	def __len__(self) -> int:
+		return len(self._cache)
+
+
+def _is_file(filename: str) -> bool:
+	# CSS containing braces or newlines can't sensibly be a filename, so don't bother checking.
+	if '{' in filename or '\n' in filename:
+		return False
+
+	try:
+		return os.path.isfile(filename)
+	except (OSError, ValueError):
+		return False
+
+
+#: The cache used by :func:`~.load_stylesheet`.
+stylesheet_cache = StylesheetCache()
+
+
+def load_stylesheet(style_data: Union[str, PathLike]) -> CompiledStylesheet:
+	"""
+	Returns the parsed stylesheet for the given css string or filename, using :data:`~.stylesheet_cache`.
+
+	:param style_data:
+	"""
+
+	return stylesheet_cache.get(style_data)
@@ -29,13 +29,15 @@
 
 # stdlib
 import re
+from collections import OrderedDict
 from functools import lru_cache, wraps
-from typing import Callable, Dict, Tuple, cast
+from typing import Any, Callable, Dict, Tuple, Union, cast
 
 # 3rd party
+import wx  # type: ignore[import-not-found]
 from cawdrey import frozendict
 
-__all__ = ["freezeargs", "parse_font"]
+__all__ = ["freezeargs", "parse_font", "FontPool", "font_pool"]
 
 
 def freezeargs(func: Callable) -> Callable:
@@ -117,3 +119,125 @@ def parse_font(style_dict: Dict) -> Tuple[str, Dict]:
 		font_data["pixelSize"] = int(font_size_value)
 
 	return colour, font_data
+
+
+class FontPool:
+	"""
+	Process-wide pool of :class:`wx.Font` and :class:`wx.Colour` objects.
+
+	Fonts are keyed by the properties returned by :func:`~.parse_font`, and colours by their value,
+	so every item in every :class:`~.PanelListCtrl` using the same font shares one native font handle.
+
+	Once the pool is full the least recently used font or colour is dropped from the pool.
+	It remains valid for any widgets still using it.
+
+	:param maxsize: The maximum number of fonts and colours to keep.
+	"""
+
+	#: The number of lookups for fonts or colours which were already in the pool.
+	hits: int
+
+	#: The number of lookups for fonts or colours which had to be created.
+	misses: int
+
+	def __init__(self, maxsize: int = 128):
+		self._maxsize = maxsize
+		self._pool: "OrderedDict[Tuple[str, Any], Union[wx.Font, wx.Colour]]" = OrderedDict()
+		self.clear()
+
+	def clear(self) -> None:
+		"""
+		Remove all fonts and colours from the pool and reset the counters.
+		"""
+
+		self._pool.clear()
+		self.hits = 0
+		self.misses = 0
+
+	@property
+	def maxsize(self) -> int:
+		"""
+		The maximum number of fonts and colours to keep.
+
+		Reducing the size discards the least recently used entries.
+		"""
+
+		return self._maxsize
+
+	@maxsize.setter
+	def maxsize(self, value: int) -> None:
+		self._maxsize = value
+		self._trim()
+
+	def get_font(self, font_data: Dict[str, Any]) -> wx.Font:
+		"""
+		Returns the font with the given properties.
+
+		:param font_data: Keyword arguments for :class:`wx.Font`, as returned by :func:`~.parse_font`.
+		"""
+
+		key = ("font", tuple(sorted(font_data.items())))
+		return self._get(key, lambda: wx.Font(**font_data))
+
+	def get_colour(self, colour: Union[str, wx.Colour]) -> wx.Colour:
+		"""
+		Returns the :class:`wx.Colour` for the given value.
+
+		:param colour: A colour name, a hex value, or a :class:`wx.Colour`.
+		"""
+
+		key: Tuple[str, Any]
+
+		if isinstance(colour, wx.Colour):
+			key = ("colour", tuple(colour.Get(includeAlpha=True)))
+		else:
+			key = ("colour", colour.lower())
+
+		return self._get(key, lambda: wx.Colour(colour))
+
+	def _get(self, key: Tuple[str, Any], factory: Callable[[], Any]) -> Any:
+		pool = self._pool
+
+		try:
+			value = pool[key]
+		except KeyError:
+			pass
+		else:
+			self.hits += 1
+			pool.move_to_end(key)
+			return value
+
+		self.misses += 1
+		value = pool[key] = factory()
+		self._trim()
+
+		return value
+
+	def _trim(self) -> None:
+		while len(self._pool) > self._maxsize:
+			self._pool.popitem(last=False)
+
+	def stats(self) -> Dict[str, int]:
+		"""
+		Returns the pool's statistics.
+
+		The dictionary contains the ``hits`` and ``misses`` counters,
+		the number of ``fonts`` and ``colours`` in the pool, and the ``maxsize`` of the pool.
+		"""
+
+		fonts = sum(1 for kind, _ in self._pool if kind == "font")
+
+		return {
+				"hits": self.hits,
+				"misses": self.misses,
+				"fonts": fonts,
+				"colours": len(self._pool) - fonts,
+				"maxsize": self._maxsize,
+				}
+
+	def __len__(self) -> int:
+		return len(self._pool)
+
+
+#: The pool shared by every :class:`~.PanelListCtrl`.
+font_pool = FontPool()
@@ -28,17 +28,21 @@ can be used as the basis for custom list items
 #
 
 # stdlib
+import bisect
+import contextlib
 import pathlib
-from typing import Dict, List, Tuple
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Container, Dict, Iterable, Iterator, List, Mapping, Optional, Set, Tuple, Union
 
 # 3rd party
 import wx  # type: ignore[import-not-found]
 
 # this package
-from domdf_wxpython_tools.panel_listctrl.css_parser import parse_css, parse_css_file
-from domdf_wxpython_tools.panel_listctrl.font_parser import parse_font
+from domdf_wxpython_tools.panel_listctrl.css_parser import CompiledStylesheet, load_stylesheet
 
-__all__ = ["PanelListCtrl", "PanelListItem"]
+__all__ = ["OwnerDrawnPanelListCtrl", "PanelListCtrl", "PanelListItem", "VirtualPanelListCtrl"]
 
 # begin wxGlade: dependencies
 # end wxGlade
@@ -49,6 +53,17 @@ __all__ = ["PanelListCtrl", "PanelListItem"]
 
 class PanelListCtrl(wx.ScrolledWindow):
 
+	#: The delay, in milliseconds, before a filter passed to :meth:`~.PanelListCtrl.SetFilter` is applied.
+	#: Filters set within this time of each other are applied together.
+	filter_delay: int = 150
+
+	#: The css class of the text searched when typing to jump to an item.
+	#: If :py:obj:`None` the first text in each item is searched.
+	type_ahead_field: Optional[str] = None
+
+	#: The time, in seconds, after which typing starts a new search rather than extending the previous one.
+	type_ahead_timeout: float = 1.0
+
 	def __init__(
 			self,
 			parent: wx.Window,
@@ -58,6 +73,7 @@ class PanelListCtrl(wx.ScrolledWindow):
 			style: int = wx.TAB_TRAVERSAL,
 			name: bytes = wx.PanelNameStr,
 			left_padding=32,
+			multiple_selection: bool = True,
 			):
 
 		wx.ScrolledWindow.__init__(self, parent, id, pos=pos, size=size, style=style | wx.TAB_TRAVERSAL, name=name)
@@ -65,6 +81,32 @@ class PanelListCtrl(wx.ScrolledWindow):
 		self._items: List[PanelListItem] = []
 		self.parent = parent
 		self.left_padding = left_padding
+		self._batch_depth = 0
+
+		#: Whether Shift and Ctrl may be used to select more than one item.
+		self.multiple_selection = multiple_selection
+
+		# The positions of the items, and of the selected items
+		self._positions: Dict[PanelListItem, int] = {}
+		self._selected: Set[int] = set()
+
+		# The item Shift+click selects from
+		self._anchor = -1
+
+		# Every item in the order they were added, including those hidden by the filter,
+		# and the same items in sorted order if the control is sorted.
+		self._all_items: List[PanelListItem] = []
+		self._sort_order: Optional[List[PanelListItem]] = None
+
+		self._sort_key: Optional[Callable[[Dict[str, str]], Any]] = None
+		self._sort_reverse = False
+		self._filter: Optional[Callable[[Dict[str, str]], bool]] = None
+		self._filter_timer: Optional[wx.CallLater] = None
+
+		# The text typed so far for type-ahead, and the sorted texts and indices of the items it searches
+		self._type_ahead = ''
+		self._type_ahead_time = 0.0
+		self._type_ahead_index: Optional[Tuple[List[Tuple[str, int]], "OrderedDict[str, List[int]]"]] = None
 
 		self.SetScrollRate(10, 10)
 
@@ -82,25 +124,59 @@ class PanelListCtrl(wx.ScrolledWindow):
 	def _on_selection_changed(self, event: wx.Event) -> None:  # noqa: PRM002
 		"""
 		Handler for EVT_LIST_ITEM_SELECTED, triggered by clicking on an Item.
+
+		Shift+click selects the items between the last clicked item and this one,
+		and Ctrl+click adds the item to, or removes it from, the selection.
 		"""
 
-		for item in self._items:
-			if item == event.GetEventObject():
-				item.SelectItem()
-			else:
-				item.DeselectItem()
+		index = self.GetItemPosition(event.GetEventObject())
+		if index != -1:
+			# The modifier keys held when the item was clicked
+			self._click(index, event.GetExtraLong())
 
 		event.Skip()
 
+	def _click(self, index: int, modifiers: int = wx.MOD_NONE) -> None:
+		"""
+		Update the selection after the item at the given index was clicked.
+
+		:param index:
+		:param modifiers: The modifier keys held when the item was clicked, e.g. :py:obj:`wx.MOD_SHIFT`.
+		"""
+
+		if self.multiple_selection and modifiers & wx.MOD_SHIFT:
+			self._select_range(index)
+		elif self.multiple_selection and modifiers & wx.MOD_CONTROL:
+			self._set_selected(self._selected ^ {index})
+			self._anchor = index
+			self._focus_row(index)
+		else:
+			self.SetSelection(index)
+
 	def _on_key_down(self, event: wx.Event) -> None:  # noqa: PRM002
 		"""
 		Handler for EVT_LIST_KEY_DOWN, triggered by pressing key on keyboard when an item is focused.
 		"""
 
-		key_code = event.GetKeyCode()
 		index = self.GetItemPosition(event.GetEventObject())
+		if index != -1:
+			# The modifier keys held when the key was pressed
+			self._key_down(index, event.GetKeyCode(), event.GetExtraLong())
+
+		event.Skip()
+
+	def _key_down(self, index: int, key_code: int, modifiers: int = wx.MOD_NONE) -> None:
+		"""
+		Move the selection in response to a key being pressed while the item at the given index is focused.
+
+		:param index:
+		:param key_code:
+		:param modifiers: The modifier keys held when the key was pressed, e.g. :py:obj:`wx.MOD_SHIFT`.
+		"""
 
-		self.DeselectAll()
+		if key_code not in _NAVIGATION_KEYS:
+			# Characters are handled by _char
+			return
 
 		if key_code == wx.WXK_UP:
 			index = index - 1
@@ -108,19 +184,206 @@ class PanelListCtrl(wx.ScrolledWindow):
 			index = index + 1
 
 		if key_code == wx.WXK_PAGEUP:
-			index = index - 5
+			index = index - self.GetCountPerPage()
 		elif key_code == wx.WXK_PAGEDOWN:
-			index = index + 5
+			index = index + self.GetCountPerPage()
 
 		if index >= self.GetItemCount():
 			index = self.GetItemCount() - 1
 		elif index < 0:
 			index = 0
 
-		self.Select(index)
+		if self.multiple_selection and modifiers & wx.MOD_SHIFT:
+			self._select_range(index)
+		else:
+			self.SetSelection(index)
 
-		event.Skip()
-		# TODO: Keyboard autocompletion?
+	def _char(self, index: int, unicode_key: int, modifiers: int = wx.MOD_NONE) -> bool:
+		"""
+		Select the next item whose text starts with the characters typed so far.
+
+		This is called when a character is typed while the item at the given index is focused.
+
+		:param index:
+		:param unicode_key: The character typed, from ``EVT_CHAR``.
+		:param modifiers: The modifier keys held when the character was typed.
+
+		:return: Whether the character was used for type-ahead.
+		"""
+
+		if unicode_key == wx.WXK_NONE:
+			return False
+
+		char = chr(unicode_key)
+		if not self._is_type_ahead_char(char, modifiers):
+			return False
+
+		found = self._find_type_ahead(index, char)
+		if found != -1:
+			self.SetSelection(found)
+
+		return True
+
+	def _is_type_ahead_char(self, char: str, modifiers: int = wx.MOD_NONE) -> bool:
+		"""
+		Returns whether the typed character should be used for type-ahead.
+
+		:param char:
+		:param modifiers: The modifier keys held when the character was typed.
+		"""
+
+		if not char.isprintable():
+			return False
+
+		# Ctrl or Alt alone are shortcuts, but AltGr, used to type some characters, reports both.
+		if (modifiers & (wx.MOD_CONTROL | wx.MOD_ALT)) in {wx.MOD_CONTROL, wx.MOD_ALT}:
+			return False
+
+		# Space only continues a search, as it might be part of the text
+		return char != ' ' or self._type_ahead_active()
+
+	def _type_ahead_active(self) -> bool:
+		return bool(self._type_ahead) and time.monotonic() - self._type_ahead_time <= self.type_ahead_timeout
+
+	def _find_type_ahead(self, index: int, char: str) -> int:
+		"""
+		Add the character to the type-ahead text and return the index of the item to select.
+
+		If no item matches ``-1`` is returned.
+
+		:param index: The index of the focused item.
+		:param char:
+		"""
+
+		if not self._type_ahead_active():
+			self._type_ahead = ''
+
+		self._type_ahead += char
+		self._type_ahead_time = time.monotonic()
+
+		if len(set(self._type_ahead)) == 1:
+			# Typing the same character repeatedly cycles through the items starting with it
+			prefix = char
+			start = index + 1
+		else:
+			prefix = self._type_ahead
+			start = index
+
+		found = self.FindItem(start, prefix, partial=True)
+		if found == -1:
+			found = self.FindItem(0, prefix, partial=True)
+
+		return found
+
+	def _get_text_dict(self, idx: int) -> Dict[str, str]:
+		return self._items[idx].GetTextDict()
+
+	def _get_type_ahead_text(self, idx: int) -> str:
+		text_dict = self._get_text_dict(idx)
+
+		if self.type_ahead_field is None:
+			return next(iter(text_dict.values()), '')
+		else:
+			return text_dict.get(self.type_ahead_field, '')
+
+	def _get_type_ahead_index(self) -> Tuple[List[Tuple[str, int]], "OrderedDict[str, List[int]]"]:
+		"""
+		Returns ``(case-folded text, index)`` pairs for the items in sorted order, and a prefix cache.
+
+		The cache holds the sorted indices of the items starting with recently searched prefixes.
+		"""
+
+		if self._type_ahead_index is None:
+			entries = sorted((self._get_type_ahead_text(idx).casefold(), idx) for idx in range(self.GetItemCount()))
+			self._type_ahead_index = (entries, OrderedDict())
+
+		return self._type_ahead_index
+
+	def FindItem(self, start: int, text: str, partial: bool = False) -> int:
+		"""
+		Find the first item at or after ``start`` whose text matches ``text``, ignoring case.
+
+		The text searched is given by :attr:`~.PanelListCtrl.type_ahead_field`.
+
+		:param start: The index to start searching from.
+		:param text:
+		:param partial: If :py:obj:`True` the item's text only has to start with ``text``.
+
+		:return: The index of the item, or ``-1`` if no item matches.
+		"""
+
+		entries, prefixes = self._get_type_ahead_index()
+		text = text.casefold()
+
+		if not partial:
+			# Items with the same text are sorted by index
+			position = bisect.bisect_left(entries, (text, start))
+			if position < len(entries) and entries[position][0] == text:
+				return entries[position][1]
+			return -1
+
+		if text in prefixes:
+			prefixes.move_to_end(text)
+			indices = prefixes[text]
+		else:
+			low = bisect.bisect_left(entries, (text, ))
+			high = bisect.bisect_left(entries, (text + chr(sys.maxunicode), ), low)
+			indices = prefixes[text] = sorted(idx for _, idx in entries[low:high])
+			_trim_cache(prefixes, 32)
+
+		position = bisect.bisect_left(indices, start)
+		return indices[position] if position < len(indices) else -1
+
+	def _set_selected(self, selected: Set[int]) -> None:
+		"""
+		Change which items are selected, redrawing only the items whose state changed.
+
+		:param selected: The indices of the items to select.
+		"""
+
+		changed = self._selected ^ selected
+		self._selected = selected
+
+		if changed:
+			self._refresh_selection(changed)
+
+	def _refresh_selection(self, changed: Set[int]) -> None:
+		"""
+		Redraw the items whose selection state has changed.
+
+		:param changed: The indices of the items.
+		"""
+
+		for index in sorted(changed):
+			item = self._items[index]
+
+			if index in self._selected:
+				item._show_selected(True)
+			else:
+				item._show_selected(False)
+
+	def _select_range(self, idx: int) -> None:
+		"""
+		Select the items between the anchor and the item at the given index, and deselect all others.
+
+		:param idx:
+		"""
+
+		if self._anchor == -1:
+			self._anchor = idx
+
+		start, end = sorted((self._anchor, idx))
+		self._set_selected(set(range(start, end + 1)))
+		self._focus_row(idx)
+
+	def _focus_row(self, idx: int) -> None:
+		"""
+		Give the keyboard focus to the item at the given index.
+
+		:param idx:
+		"""
+
+		self._items[idx].SetFocus()
 
 	def SetSelection(self, idx: int) -> None:
 		"""
@@ -129,21 +392,19 @@ class PanelListCtrl(wx.ScrolledWindow):
 		:param idx: index of the item to select.
 		"""
 
-		item_to_select = self.GetItem(idx)
+		if not 0 <= idx < self.GetItemCount():
+			raise IndexError("list index out of range")
 
-		for item in self._items:
-			if item == item_to_select:
-				item.SelectItem()
-			else:
-				item.DeselectItem()
+		self._set_selected({idx})
+		self._anchor = idx
+		self._focus_row(idx)
 
 	def DeselectAll(self) -> None:
 		"""
 		Deselect all items.
 		"""
 
-		for i in range(self.GetItemCount()):
-			self.Select(i, False)
+		self._set_selected(set())
 
 	def AcceptsFocus(self) -> bool:
 		return True
@@ -155,14 +416,79 @@ class PanelListCtrl(wx.ScrolledWindow):
 		"""
 		Append a :class:`~.PanelListItem` object, or an instance of a custom subclass, to the control.
 
+		If the control is sorted the item is added at the end, and if it doesn't match the filter it is hidden.
+
 		:param panel_list_item:
 		"""
 
+		self._all_items.append(panel_list_item)
+
+		if self._sort_order is not None:
+			self._sort_order.append(panel_list_item)
+
+		if self._filter is not None and not self._filter(panel_list_item.GetTextDict()):
+			panel_list_item.Hide()
+			return
+
 		self.sizer_1.Add(panel_list_item, 0, wx.EXPAND, wx.TOP, 0)
+		self._type_ahead_index = None
+		self._positions[panel_list_item] = len(self._items)
 		self._items.append(panel_list_item)
+
+		if panel_list_item.IsSelected():
+			self._selected.add(self._positions[panel_list_item])
+
+		if not self._batch_depth:
+			self._do_layout()
+
+	def _do_layout(self) -> None:
 		self.sizer_1.Fit(self)
 		self.Layout()
 
+	@contextlib.contextmanager
+	def Batch(self) -> Iterator[None]:
+		"""
+		Context manager which freezes the control and defers laying out the items until the end of the block.
+
+		.. code-block:: python
+
+			with list_ctrl.Batch():
+				for text_dict in text_dicts:
+					list_ctrl.AppendNewItem(text_dict, style_data)
+
+		Batches may be nested, in which case the layout happens at the end of the outermost batch.
+		"""
+
+		self._batch_depth += 1
+		if self._batch_depth == 1:
+			self.Freeze()
+
+		try:
+			yield
+		finally:
+			self._batch_depth -= 1
+			if not self._batch_depth:
+				self._do_layout()
+				self.Thaw()
+
+	def AppendItems(self, text_dicts: Iterable[Dict], style_data) -> List["PanelListItem"]:
+		"""
+		Append a new :class:`~.PanelListItem` to the control for each of the ``text_dicts``.
+
+		The stylesheet is parsed once and shared between the new items,
+		and the control is laid out once after all items have been added.
+
+		:param text_dicts:
+		:param style_data: The style data for the items. See :class:`~.PanelListItem`.
+
+		:return: The new PanelListItem objects that were added to the control.
+		"""
+
+		style_data = _load_style_data(style_data)
+
+		with self.Batch():
+			return [self.AppendNewItem(text_dict, style_data) for text_dict in text_dicts]
+
 	def AppendNewItem(self, text_dict: Dict, style_data) -> "PanelListItem":
 		"""
 		Append a new 'PanelListItem' object to the control, passing the 'text_dict' and 'style_data' parameters to the new object.
@@ -182,14 +508,19 @@ class PanelListCtrl(wx.ScrolledWindow):
 		Removes all items from the control.
 		"""
 
-		for item in self._items:
-			self.sizer_1.Hide(item)
-			self.sizer_1.Remove(0)
+		with self.Batch():
+			self.sizer_1.Clear()
 
-			item.Destroy()
-			self.Layout()
+			for item in self._all_items:
+				item.Destroy()
 
-		self._items = []
+			self._all_items = []
+			self._sort_order = [] if self._sort_order is not None else None
+			self._items = []
+			self._type_ahead_index = None
+			self._positions = {}
+			self._selected = set()
+			self._anchor = -1
 
 		event = wx.ListEvent(wx.wxEVT_LIST_DELETE_ALL_ITEMS)
 		event.SetEventObject(self)
@@ -207,22 +538,44 @@ class PanelListCtrl(wx.ScrolledWindow):
 			(usually because the item wasn't in the control)
 		"""
 
-		for index, widget in enumerate(self._items):
-			if widget == item:
-				self.sizer_1.Hide(self._items.pop(index))
-				self.sizer_1.Remove(index)
+		if item not in self._all_items:
+			return False
 
-				item.Destroy()
+		self._all_items.remove(item)
 
-				self.Layout()
+		if self._sort_order is not None:
+			self._sort_order.remove(item)
 
-				event = wx.ListEvent(wx.wxEVT_LIST_DELETE_ITEM)
-				event.SetEventObject(self)
-				wx.PostEvent(self, event)
+		# Items hidden by the filter aren't in the sizer
+		index = self.GetItemPosition(item)
 
-				return True
+		if index != -1:
+			self.sizer_1.Hide(self._items.pop(index))
+			self.sizer_1.Remove(index)
+			del self._positions[item]
+			self._type_ahead_index = None
 
-		return False
+			# Items after the removed one move up
+			for position in range(index, len(self._items)):
+				self._positions[self._items[position]] = position
+
+			self._selected = {idx - (idx > index) for idx in self._selected if idx != index}
+
+			if self._anchor == index:
+				self._anchor = -1
+			elif self._anchor > index:
+				self._anchor -= 1
+
+		item.Destroy()
+
+		if not self._batch_depth:
+			self.Layout()
+
+		event = wx.ListEvent(wx.wxEVT_LIST_DELETE_ITEM)
+		event.SetEventObject(self)
+		wx.PostEvent(self, event)
+
+		return True
 
 	def Focus(self, idx: int) -> None:
 		"""
@@ -231,11 +584,7 @@ class PanelListCtrl(wx.ScrolledWindow):
 		:param idx:
 		"""
 
-		for index, item in enumerate(self._items):
-			if index == idx:
-				item.SelectItem()
-			else:
-				item.DeselectItem()
+		self.SetSelection(idx)
 
 	def GetColumnCount(self) -> int:
 		"""
@@ -244,26 +593,24 @@ class PanelListCtrl(wx.ScrolledWindow):
 
 		return 1
 
-#
-# 	def GetCountPerPage(self) -> int:
-# 		"""
-# 		GetCountPerPage() -> int
-#
-# 		Gets the number of items that can fit vertically in the visible area
-# 		of the list control (list or report view) or the total number of items
-# 		in the list control (icon or small icon view).
-# 		"""
-# 		return 0
-#
+	def GetCountPerPage(self) -> int:
+		"""
+		Returns the number of items that can fit vertically in the visible area of the control.
+		"""
+
+		if not self._items:
+			return 1
+
+		item_height = max(self._items[0].GetSize().height, 1)
+		return max(self.GetClientSize().height // item_height, 1)
 
 	def GetFirstSelected(self, *_) -> int:  # noqa: PRM002
 		"""
 		Returns the first selected item, or -1 when none is selected.
 		"""
 
-		for item in self._items:
-			if item.IsSelected():
-				return item
+		if self._selected:
+			return self._items[min(self._selected)]
 
 		return -1
 
@@ -272,11 +619,7 @@ class PanelListCtrl(wx.ScrolledWindow):
 		Gets the currently focused item or -1 if none is focused.
 		"""
 
-		for item in self._items:
-			if item.IsSelected():
-				return item
-
-		return -1
+		return self.GetFirstSelected()
 
 	def GetItem(self, itemIdx: int, *_) -> "PanelListItem":  # noqa: PRM002
 		"""
@@ -310,10 +653,7 @@ class PanelListCtrl(wx.ScrolledWindow):
 		:param item:
 		"""
 
-		if item in self._items:
-			return self._items.index(item)
-
-		return -1
+		return self._positions.get(item, -1)
 
 	def GetNextSelected(self, item) -> int:
 		"""
@@ -323,27 +663,26 @@ class PanelListCtrl(wx.ScrolledWindow):
 		"""
 
 		index_of_item = self.GetItemPosition(item)
+		next_index = min((idx for idx in self._selected if idx > index_of_item), default=-1)
 
-		for index, item in enumerate(self._items):
-			if index <= index_of_item:
-				continue
-			if item.IsSelected():
-				return item
+		if next_index == -1:
+			return -1
 
-		return -1
+		return self._items[next_index]
 
 	def GetSelectedItemCount(self) -> int:
 		"""
 		Returns the number of selected items in the list control.
 		"""
 
-		selected_item_count = 0
+		return len(self._selected)
 
-		for item in self._items:
-			if item.IsSelected():
-				selected_item_count += 1
+	def GetSelectedItems(self) -> List[int]:
+		"""
+		Returns the indices of the selected items, in order.
+		"""
 
-		return selected_item_count
+		return sorted(self._selected)
 #
 # 	def HitTest(self, point):
 # 		"""
@@ -382,7 +721,7 @@ class PanelListCtrl(wx.ScrolledWindow):
 		:param idx:
 		"""
 
-		return self._items[idx].IsSelected()
+		return idx in self._selected
 
 	def RefreshItem(self, item) -> None:
 		"""
@@ -402,6 +741,8 @@ class PanelListCtrl(wx.ScrolledWindow):
 		:param itemTo:
 		"""
 
+		self._type_ahead_index = None
+
 		for index in range(itemFrom, itemTo + 1):
 			self.RefreshItem(self._items[index])
 #
@@ -421,15 +762,114 @@ class PanelListCtrl(wx.ScrolledWindow):
 		:param on:
 		"""
 
-		self._items[idx].SelectItem(on)
+		if on:
+			self._set_selected(self._selected | {idx})
+			self._focus_row(idx)
+		else:
+			self._set_selected(self._selected - {idx})
+
+	def SortItems(self, key: Optional[Callable[[Dict[str, str]], Any]] = None, reverse: bool = False) -> bool:
+		"""
+		Sort the items in the list control.
+
+		The items are reordered rather than being created again, and the selected items stay selected.
 
-# 	def SortItems(self, fnSortCallBack) -> bool:
-# 		"""
-# 		SortItems(fnSortCallBack) -> bool
-#
-# 		Call this function to sort the items in the list control.
-# 		"""
-# 		return False
+		:param key: Function which is called with the ``text_dict`` of each item and returns the value to sort by.
+			If :py:obj:`None` the items are shown in the order they were added.
+		:param reverse: Whether to sort in descending order.
+		"""
+
+		self._sort_key = key
+		self._sort_reverse = reverse
+		self._sort()
+		self._update_view()
+
+		return True
+
+	def SetFilter(
+			self,
+			predicate: Optional[Callable[[Dict[str, str]], bool]],
+			immediate: bool = False,
+			) -> None:
+		"""
+		Only show the items which match the filter.
+
+		The filter is applied after :attr:`~.PanelListCtrl.filter_delay` milliseconds,
+		so calling this method as the user types only updates the control once they pause.
+		Items which are hidden by the filter are deselected.
+
+		:param predicate: Function which is called with the ``text_dict`` of each item and returns whether to show it.
+			If :py:obj:`None` all items are shown.
+		:param immediate: Apply the filter now rather than after the delay.
+		"""
+
+		self._filter = predicate
+
+		if immediate:
+			self._update_view()
+		elif self._filter_timer is None:
+			self._filter_timer = wx.CallLater(self.filter_delay, self._on_filter_timer)
+		else:
+			self._filter_timer.Start(self.filter_delay)
+
+	def _on_filter_timer(self) -> None:
+		# The control may have been destroyed while the timer was running
+		if self:
+			self._update_view()
+
+	def _sort(self) -> None:
+		"""
+		Calculate the sorted order of the items from the sort key.
+		"""
+
+		if self._sort_key is None:
+			self._sort_order = None
+		else:
+			key = self._sort_key
+			self._sort_order = sorted(
+					self._all_items,
+					key=lambda item: key(item.GetTextDict()),
+					reverse=self._sort_reverse,
+					)
+
+	def _update_view(self) -> None:
+		"""
+		Show the items which match the filter in the sorted order, laying out the control once.
+		"""
+
+		if self._filter_timer is not None:
+			self._filter_timer.Stop()
+
+		ordered = self._all_items if self._sort_order is None else self._sort_order
+
+		if self._filter is None:
+			shown = list(ordered)
+		else:
+			shown = [item for item in ordered if self._filter(item.GetTextDict())]
+
+		selected_items = {self._items[idx] for idx in self._selected}
+		anchor_item = self._items[self._anchor] if self._anchor != -1 else None
+
+		with self.Batch():
+			self.sizer_1.Clear()
+
+			self._items = shown
+			self._positions = {item: position for position, item in enumerate(shown)}
+			self._type_ahead_index = None
+
+			for item in shown:
+				self.sizer_1.Add(item, 0, wx.EXPAND, wx.TOP, 0)
+				item.Show()
+
+			for item in self._all_items:
+				if item not in self._positions:
+					item.Hide()
+
+					if item in selected_items:
+						item._show_selected(False)
+
+			self._selected = {self._positions[item] for item in selected_items if item in self._positions}
+			self._anchor = -1 if anchor_item is None else self._positions.get(anchor_item, -1)
 
 	@property
 	def ColumnCount(self) -> int:
@@ -439,15 +879,13 @@ class PanelListCtrl(wx.ScrolledWindow):
 
 		return 1
 
-#
-# 	CountPerPage = property(lambda self: object(), lambda self, v: None, lambda self: None)  # default
-# 	"""GetCountPerPage() -> int
-#
-# Gets the number of items that can fit vertically in the visible area
-# of the list control (list or report view) or the total number of items
-# in the list control (icon or small icon view)."""
-#
-#
+	@property
+	def CountPerPage(self) -> int:
+		"""
+		Returns the number of items that can fit vertically in the visible area of the control.
+		"""
+
+		return self.GetCountPerPage()
 
 	@property
 	def FocusedItem(self) -> int:
@@ -463,7 +901,7 @@ class PanelListCtrl(wx.ScrolledWindow):
 		Returns the number of items in the list control.
 		"""
 
-		return len(self._items)
+		return self.GetItemCount()
 
 
 # end of class RecentProjectsPanel
@@ -498,27 +936,8 @@ class PanelListItem(wx.Panel):
 		if not isinstance(text_dict, dict):
 			raise TypeError("'text_dict' must be a dict containing 'css class:text' pairs")
 
-		if isinstance(style_data, pathlib.Path):
-			# Filename provided
-			style_data = parse_css_file(style_data)
-		if isinstance(style_data, str):
-			# Filename or css provided
-			try:
-				# CSS
-				style_data = parse_css(style_data)
-			except ValueError:
-				# Filename
-				style_data = parse_css_file(style_data)
-
-		elif not isinstance(style_data, dict):
-			raise TypeError(
-					"""'style_data' must be either:
-	> A string or pathlib.Path object pointing to a css file, or
-	> A dictionary containing the style data, or
-	> A string containing css properties.""",
-					)
-
-		self.style_data = style_data
+		self.style_data = _load_style_data(style_data)
+		self._text_dict = dict(text_dict)
 
 		wx.Panel.__init__(self, parent, id, style=style | wx.TAB_TRAVERSAL | wx.WANTS_CHARS, name=name)
 
@@ -529,6 +948,7 @@ class PanelListItem(wx.Panel):
 		self.Bind(wx.EVT_LEFT_DCLICK, self.OnDoubleClick)
 		self.Bind(wx.EVT_MIDDLE_UP, self.OnMiddleClick)
 		self.Bind(wx.EVT_KEY_DOWN, self.OnKeyDown)
+		self.Bind(wx.EVT_CHAR, self.OnChar)
 
 		# for wxMSW
 		self.Bind(wx.EVT_COMMAND_RIGHT_CLICK, self.OnRightClick)
@@ -537,14 +957,12 @@ class PanelListItem(wx.Panel):
 		self.Bind(wx.EVT_RIGHT_UP, self.OnRightClick)
 
 		# Background colour settings for panel
-		if "li" in self.style_data and "background-color" in self.style_data["li"]:
-			self._default_background = self.style_data["li"]["background-color"]
-		else:
+		self._default_background = self.style_data.background_colour()
+		if self._default_background is None:
 			self._default_background = wx.SystemSettings.GetColour(wx.SYS_COLOUR_LISTBOX)
 
-		if "li::selection" in self.style_data and "background-color" in self.style_data["li::selection"]:
-			self._selected_background = self.style_data["li::selection"]["background-color"]
-		else:
+		self._selected_background = self.style_data.background_colour(selected=True)
+		if self._selected_background is None:
 			self._selected_background = wx.SystemSettings.GetColour(wx.SYS_COLOUR_MENUHILIGHT)
 
 		self._items: Dict[str, wx.StaticText] = {}
@@ -566,6 +984,7 @@ class PanelListItem(wx.Panel):
 
 			widget.Bind(wx.EVT_LEFT_UP, self.OnClick)
 			widget.Bind(wx.EVT_KEY_DOWN, self.OnKeyDown)
+			widget.Bind(wx.EVT_CHAR, self.OnChar)
 			widget.Bind(wx.EVT_LEFT_DCLICK, self.OnDoubleClick)
 			widget.Bind(wx.EVT_MIDDLE_UP, self.OnMiddleClick)
 			# for wxMSW
@@ -589,17 +1008,36 @@ class PanelListItem(wx.Panel):
 		:param select: If :py:obj:`False` the item is deselected.
 		"""
 
-		self.selected = select
+		index = self.parent.GetItemPosition(self) if isinstance(self.parent, PanelListCtrl) else -1
+
+		if index == -1:
+			# Not shown in a PanelListCtrl
+			self._show_selected(select)
+		elif select:
+			self.parent._set_selected(self.parent._selected | {index})
+		else:
+			self.parent._set_selected(self.parent._selected - {index})
+
 		if select:
 			self.SetFocus()
-		self.Refresh()
 
 	def DeselectItem(self):  # noqa: D102
-		self.selected = False
+		self.SelectItem(False)
+
+	def _show_selected(self, selected: bool) -> None:
+		"""
+		Redraw the item as selected or not, without changing the selection of the :class:`~.PanelListCtrl`.
+
+		:param selected:
+		"""
+
+		self.selected = selected
 		self.Refresh()
-		event = wx.ListEvent(wx.wxEVT_LIST_ITEM_DESELECTED)
-		event.SetEventObject(self)
-		wx.PostEvent(self, event)
+
+		if not selected:
+			event = wx.ListEvent(wx.wxEVT_LIST_ITEM_DESELECTED)
+			event.SetEventObject(self)
+			wx.PostEvent(self, event)
 
 	def OnRightClick(self, _) -> None:  # noqa: D102
 		event = wx.ListEvent(wx.wxEVT_LIST_ITEM_RIGHT_CLICK)
@@ -611,9 +1049,11 @@ class PanelListItem(wx.Panel):
 		event.SetEventObject(self)
 		wx.PostEvent(self, event)
 
-	def OnClick(self, _) -> None:  # noqa: D102
+	def OnClick(self, mouse_event: wx.MouseEvent) -> None:  # noqa: D102
 		event = wx.ListEvent(wx.wxEVT_LIST_ITEM_SELECTED)
 		event.SetEventObject(self)
+		# The modifier keys are recorded now, as they may be released by the time the event is handled.
+		event.SetExtraLong(mouse_event.GetModifiers())
 		wx.PostEvent(self, event)
 
 	def OnDoubleClick(self, _) -> None:  # noqa: D102
@@ -631,8 +1071,25 @@ class PanelListItem(wx.Panel):
 		event = wx.ListEvent(wx.wxEVT_LIST_KEY_DOWN)
 		event.SetEventObject(self)
 		event.SetKeyCode(key_event.GetKeyCode())
+		event.SetExtraLong(key_event.GetModifiers())
 		wx.PostEvent(self, event)
 
+		# Allow EVT_CHAR to be generated for type-ahead
+		key_event.Skip()
+
+	def OnChar(self, event: wx.KeyEvent) -> None:
+		"""
+
+		:param event: The wxPython event.
+		"""
+
+		if isinstance(self.parent, PanelListCtrl):
+			index = self.parent.GetItemPosition(self)
+			if index != -1 and self.parent._char(index, event.GetUnicodeKey(), event.GetModifiers()):
+				return
+
+		event.Skip()
+
 	def IsSelected(self) -> bool:
 		"""
 		Returns whether the :class:`~.PanelListItem` is selected.
@@ -648,15 +1105,9 @@ class PanelListItem(wx.Panel):
 
 	def _refresh_text(self) -> None:
 		for classname, widget in self._items.items():
-			if self.selected:
-				class_style_data = self.style_data[f"li p.{classname}::selection"]
-			else:
-				class_style_data = self.style_data[f"li p.{classname}"]
-
-			colour, font_data = parse_font(class_style_data)
-
-			widget.SetForegroundColour(colour)
-			widget.SetFont(wx.Font(**font_data))
+			text_style = self.style_data.text_style(classname, self.selected)
+			widget.SetForegroundColour(text_style.colour)
+			widget.SetFont(text_style.font)
 
 	def SetBackgroundColour(self, colour) -> None:
 		"""
@@ -694,5 +1145,1151 @@ class PanelListItem(wx.Panel):
 	def GetContents(self) -> List[wx.StaticText]:
 		return list(self._items.values())
 
+	def GetTextDict(self) -> Dict[str, str]:
+		"""
+		Returns a dictionary of ``css class: text`` pairs for the text displayed in the item.
+		"""
+
+		return dict(self._text_dict)
+
+	def SetTextDict(self, text_dict: Dict[str, str]) -> None:
+		"""
+		Change the text displayed in the item.
+
+		:param text_dict: Dictionary of ``css class: text`` pairs.
+			The css classes must be the same as those the item was created with.
+		"""
+
+		for css_class, text in text_dict.items():
+			if self._text_dict.get(css_class) != text:
+				self._items[css_class].SetLabel(text)
+				self._text_dict[css_class] = text
+
 
 # end of class RecentProjectItem
+
+
+def _load_style_data(style_data) -> CompiledStylesheet:  # noqa: PRM002
+	"""
+	Returns the compiled stylesheet for the ``style_data`` argument of :class:`~.PanelListItem`.
+
+	Stylesheets given as strings or filenames are shared between items via :data:`~.stylesheet_cache`.
+	"""
+
+	if isinstance(style_data, CompiledStylesheet):
+		return style_data
+
+	elif isinstance(style_data, (str, pathlib.Path)):
+		# Filename or css provided
+		return load_stylesheet(style_data)
+
+	elif isinstance(style_data, Mapping):
+		return CompiledStylesheet(style_data)
+
+	raise TypeError(
+			"""'style_data' must be either:
+	> A string or pathlib.Path object pointing to a css file, or
+	> A dictionary containing the style data, or
+	> A string containing css properties.""",
+			)
+
+
+class VirtualPanelListCtrl(PanelListCtrl):
+	"""
+	A :class:`~.PanelListCtrl` which only creates :class:`~.PanelListItem` objects for the visible rows.
+
+	The number of items is set with :meth:`~.VirtualPanelListCtrl.SetItemCount`, and the text for each
+	item is obtained by calling ``data_provider`` with the index of the item. As the list is scrolled
+	a small pool of :class:`~.PanelListItem` objects is reused for the rows which become visible.
+
+	If ``data_provider`` is :py:obj:`None` the control stores the ``text_dict`` of each item itself,
+	and items are added with :meth:`~.VirtualPanelListCtrl.AppendTextDict` and
+	:meth:`~.VirtualPanelListCtrl.AppendTextDicts`, and removed with :meth:`~.VirtualPanelListCtrl.DeleteItem`.
+
+	Methods such as :meth:`~.VirtualPanelListCtrl.GetFirstSelected` return the index of the item rather than
+	the :class:`~.PanelListItem`, as the item may not currently have a :class:`~.PanelListItem`.
+
+	When the control is sorted or filtered the ``data_provider`` is still called with the original index
+	of the item, which can be obtained with :meth:`~.VirtualPanelListCtrl.GetDataIndex`.
+
+	:param parent: The parent window.
+	:param data_provider: Function which returns the ``text_dict`` for the item at the given index.
+		If :py:obj:`None` the control stores the items itself.
+	:param style_data: The style data for the items. See :class:`~.PanelListItem`.
+	:param item_count: The initial number of items.
+	:param id: An identifier for the control. ID_ANY is taken to mean a default.
+	:param pos: The control position.
+	:param size: The control size.
+	:param style: The window style. See :class:`wx.ScrolledWindow`.
+	:param name: Window name.
+	:param left_padding: The spacing to the left of the text in each item.
+	:param multiple_selection: Whether Shift and Ctrl may be used to select more than one item.
+	"""
+
+	# The attributes holding the index of an item, such as the anchor for Shift+click,
+	# which are updated to follow the item when the control is sorted or filtered or an item is removed.
+	_tracked_rows: Tuple[str, ...] = ("_anchor", )
+
+	def __init__(
+			self,
+			parent: wx.Window,
+			data_provider: Optional[Callable[[int], Dict[str, str]]],
+			style_data,
+			item_count: int = 0,
+			id: int = wx.ID_ANY,  # noqa: A002  # pylint: disable=redefined-builtin
+			pos: Tuple[int, int] = wx.DefaultPosition,
+			size: Tuple[int, int] = wx.DefaultSize,
+			style: int = wx.TAB_TRAVERSAL,
+			name: bytes = wx.PanelNameStr,
+			left_padding=32,
+			multiple_selection: bool = True,
+			):
+
+		PanelListCtrl.__init__(self, parent, id, pos, size, style, name, left_padding, multiple_selection)
+
+		# Rows are positioned manually
+		self.SetSizer(None)
+		del self.sizer_1
+
+		# The text_dicts of the items, if the control stores them itself
+		self._data: Optional[List[Dict[str, str]]] = None
+
+		if data_provider is None:
+			self._data = []
+			data_provider = self._data.__getitem__
+
+		self.data_provider = data_provider
+		self.style_data = _load_style_data(style_data)
+
+		# The number of items from the data_provider, and the number shown after filtering
+		self._data_count = 0
+		self._item_count = 0
+
+		# The indices of the items in the data_provider, in the order they are shown,
+		# or None if the control is neither sorted nor filtered.
+		self._view: Optional[List[int]] = None
+
+		# The indices of the items in the data_provider in sorted order, or None if the control is not sorted.
+		self._sorted_indices: Optional[List[int]] = None
+
+		self._row_height = 0
+		self._pool: List[PanelListItem] = []
+		self._visible: Dict[int, PanelListItem] = {}
+
+		self.Bind(wx.EVT_SIZE, self._on_view_changed)
+		self.Bind(wx.EVT_SCROLLWIN, self._on_view_changed)
+		self.Bind(wx.EVT_MOUSEWHEEL, self._on_view_changed)
+
+		self.SetItemCount(item_count)
+
+	def _do_layout(self) -> None:
+		self._update_virtual_size()
+		self.RefreshItems(0, self._item_count - 1)
+
+	def _update_virtual_size(self) -> None:
+		"""
+		Set the scrollable height of the control from the number of items.
+		"""
+
+		if self._item_count and not self._row_height:
+			self._row_height = self._get_row_height()
+			self.SetScrollRate(0, self._row_height)
+
+		self.SetVirtualSize((-1, self._item_count * self._row_height))
+
+	def AppendTextDicts(self, text_dicts: Iterable[Dict]) -> List[int]:
+		"""
+		Append an item to the control for each of the ``text_dicts``.
+
+		The items are sorted, filtered and laid out once after all of them have been added.
+
+		:param text_dicts:
+
+		:return: The indices of the new items, before any sorting or filtering.
+		"""
+
+		data = self._get_data()
+		start = len(data)
+		data.extend(dict(text_dict) for text_dict in text_dicts)
+		self.SetItemCount(len(data))
+
+		return list(range(start, len(data)))
+
+	def _on_view_changed(self, event: wx.Event) -> None:  # noqa: PRM002
+		"""
+		Handler for the control being resized or scrolled.
+		"""
+
+		event.Skip()
+		wx.CallAfter(self._update_rows)
+
+	def _new_item(self, index: int) -> PanelListItem:
+		item = PanelListItem(self, self._get_text_dict(index), self.style_data, left_padding=self.left_padding)
+		self._pool.append(item)
+		return item
+
+	def _get_row_height(self) -> int:
+		"""
+		Returns the height of each row.
+		"""
+
+		return self._new_item(0).GetBestSize().height
+
+	def SetItemCount(self, count: int) -> None:
+		"""
+		Set the number of items provided by the ``data_provider``.
+
+		If the control is sorted or filtered the items are sorted and filtered again.
+
+		:param count:
+		"""
+
+		self._data_count = count
+		self._sort()
+		self._update_view()
+
+	def GetDataIndex(self, idx: int) -> int:
+		"""
+		Returns the index passed to the ``data_provider`` for the item shown at the given index.
+
+		This differs from the index of the item when the control is sorted or filtered.
+
+		:param idx:
+		"""
+
+		return idx if self._view is None else self._view[idx]
+
+	def _get_text_dict(self, idx: int) -> Dict[str, str]:
+		return self.data_provider(self.GetDataIndex(idx))
+
+	def GetCountPerPage(self) -> int:
+		"""
+		Returns the number of items that can fit vertically in the visible area of the control.
+		"""
+
+		return max(self.GetClientSize().height // (self._row_height or 1), 1)
+
+	def _sort(self) -> None:
+		if self._sort_key is None:
+			self._sorted_indices = None
+		else:
+			key = self._sort_key
+			self._sorted_indices = sorted(
+					range(self._data_count),
+					key=lambda idx: key(self.data_provider(idx)),
+					reverse=self._sort_reverse,
+					)
+
+	def _update_view(self) -> None:
+		"""
+		Calculate which items are shown, and in what order, from the sort order and filter.
+		"""
+
+		if self._filter_timer is not None:
+			self._filter_timer.Stop()
+
+		ordered: Iterable[int] = range(self._data_count) if self._sorted_indices is None else self._sorted_indices
+
+		# Keep the same items selected
+		selected = {self.GetDataIndex(idx) for idx in self._selected}
+		tracked = {name: self._get_data_index(getattr(self, name)) for name in self._tracked_rows}
+
+		if self._filter is not None:
+			self._view = [idx for idx in ordered if self._filter(self.data_provider(idx))]
+		elif self._sorted_indices is not None:
+			self._view = list(ordered)
+		else:
+			self._view = None
+
+		if self._view is None:
+			count = self._data_count
+			self._selected = {idx for idx in selected if idx < count}
+
+			for name, data_idx in tracked.items():
+				setattr(self, name, data_idx if data_idx < count else -1)
+		else:
+			count = len(self._view)
+			positions = {data_idx: idx for idx, data_idx in enumerate(self._view)}
+			self._selected = {positions[data_idx] for data_idx in selected if data_idx in positions}
+
+			for name, data_idx in tracked.items():
+				setattr(self, name, positions.get(data_idx, -1))
+
+		self._item_count = count
+		self._do_layout()
+
+	def _get_data_index(self, idx: int) -> int:
+		"""
+		Returns the index passed to the ``data_provider`` for the item shown at the given index.
+
+		Unlike :meth:`~.VirtualPanelListCtrl.GetDataIndex`, ``-1`` is returned for an index of ``-1``.
+
+		:param idx:
+		"""
+
+		return self.GetDataIndex(idx) if idx != -1 else -1
+
+	def _get_visible_rows(self) -> Tuple[int, int]:
+		"""
+		Returns the index of the first visible row, and one more than the index of the last visible row.
+		"""
+
+		row_height = self._row_height or 1
+		client_height = self.GetClientSize().height
+		view_top = self.CalcUnscrolledPosition(0, 0)[1]
+
+		first = min(view_top // row_height, self._item_count)
+		last = min((view_top + client_height) // row_height + 1, self._item_count)
+
+		return first, last
+
+	def _update_rows(self) -> None:
+		"""
+		Assign the pooled :class:`~.PanelListItem` objects to the visible rows.
+		"""
+
+		if not self:
+			return
+
+		row_height = self._row_height or 1
+		client_width = self.GetClientSize().width
+		first, last = self._get_visible_rows()
+
+		previous = self._visible
+		self._visible = {}
+
+		# Reuse items which are still visible, then those which are not.
+		available = [item for index, item in previous.items() if not first <= index < last]
+		available.extend(item for item in self._pool if item not in previous.values())
+
+		for index in range(first, last):
+			if index in previous:
+				item = previous[index]
+			else:
+				item = available.pop() if available else self._new_item(index)
+				item.SetTextDict(self._get_text_dict(index))
+
+			if item.IsSelected() != (index in self._selected):
+				item.selected = index in self._selected
+				item.Refresh()
+
+			item.SetSize(wx.Rect(self.CalcScrolledPosition(0, index * row_height), (client_width, row_height)))
+			item.Show()
+			self._visible[index] = item
+
+		for item in available:
+			item.Hide()
+
+	def EnsureVisible(self, idx: int) -> None:
+		"""
+		Scroll the control so the item at the given index is visible.
+
+		:param idx:
+		"""
+
+		row_height = self._row_height or 1
+		view_top = self.CalcUnscrolledPosition(0, 0)[1]
+		rows_per_page = self.GetCountPerPage()
+		first_visible = -(-view_top // row_height)
+
+		if idx < first_visible:
+			self.Scroll(-1, idx)
+		elif idx >= first_visible + rows_per_page:
+			self.Scroll(-1, idx - rows_per_page + 1)
+
+		self._update_rows()
+
+	def _refresh_selection(self, changed: Set[int]) -> None:
+		self._update_rows()
+
+	def _focus_row(self, idx: int) -> None:
+		self.EnsureVisible(idx)
+		self._visible[idx].SetFocus()
+
+	def _get_data(self) -> List[Dict[str, str]]:
+		"""
+		Returns the list of the ``text_dict`` of each item, if the control stores them itself.
+		"""
+
+		if self._data is None:
+			raise TypeError(
+					"Items can only be added to or removed from a VirtualPanelListCtrl "
+					"created without a data_provider. Use SetItemCount instead.",
+					)
+
+		return self._data
+
+	def Append(self, panel_list_item: PanelListItem) -> None:
+		"""
+		Append the text of a :class:`~.PanelListItem` to the control.
+
+		The control draws its rows with its own :class:`~.PanelListItem` objects, so ``panel_list_item`` is destroyed.
+
+		:param panel_list_item:
+		"""
+
+		self.AppendTextDict(panel_list_item.GetTextDict())
+		panel_list_item.Destroy()
+
+	def AppendItems(self, text_dicts: Iterable[Dict], style_data) -> List[PanelListItem]:
+		"""
+		Not supported, as the control does not keep a :class:`~.PanelListItem` for each item.
+
+		Use :meth:`~.VirtualPanelListCtrl.AppendTextDicts` instead.
+
+		:param text_dicts:
+		:param style_data:
+		"""
+
+		raise TypeError(f"{type(self).__name__} does not support AppendItems. Use AppendTextDicts instead.")
+
+	def AppendNewItem(self, text_dict: Dict, style_data) -> PanelListItem:
+		"""
+		Not supported, as the control does not keep a :class:`~.PanelListItem` for each item.
+
+		Use :meth:`~.VirtualPanelListCtrl.AppendTextDict` instead.
+
+		:param text_dict:
+		:param style_data:
+		"""
+
+		raise TypeError(f"{type(self).__name__} does not support AppendNewItem. Use AppendTextDict instead.")
+
+	def AppendTextDict(self, text_dict: Dict) -> int:
+		"""
+		Append an item with the given text to the control.
+
+		:param text_dict:
+
+		:return: The index of the new item, before any sorting or filtering.
+		"""
+
+		data = self._get_data()
+		data.append(dict(text_dict))
+		self._insert_data_index(len(data) - 1)
+
+		return len(data) - 1
+
+	def _insert_data_index(self, data_idx: int) -> None:
+		"""
+		Show the item which has been added to the end of the ``data_provider`` with the given index.
+
+		Only the new item is sorted and filtered, and the control is laid out unless in a :meth:`~.PanelListCtrl.Batch`.
+
+		:param data_idx:
+		"""
+
+		self._data_count += 1
+		self._type_ahead_index = None
+
+		if self._sorted_indices is not None:
+			self._sorted_indices.insert(self._bisect_sorted(self._sorted_indices, data_idx), data_idx)
+
+		if self._filter is not None and not self._filter(self.data_provider(data_idx)):
+			return
+
+		if self._view is None:
+			position = self._item_count
+		elif self._sorted_indices is not None:
+			position = self._bisect_sorted(self._view, data_idx)
+			self._view.insert(position, data_idx)
+		else:
+			position = len(self._view)
+			self._view.append(data_idx)
+
+		self._item_count += 1
+		self._move_rows(position, 1)
+
+		if not self._batch_depth:
+			self._do_layout()
+
+	def _bisect_sorted(self, indices: List[int], data_idx: int) -> int:
+		"""
+		Returns the position at which to insert ``data_idx`` into ``indices``, which are in sorted order.
+
+		The item goes after any which sort equally, as the item with the highest index does with :func:`sorted`.
+
+		:param indices: Indices of items in the ``data_provider``.
+		:param data_idx:
+		"""
+
+		key = self._sort_key
+		assert key is not None
+
+		value = key(self.data_provider(data_idx))
+		low, high = 0, len(indices)
+
+		while low < high:
+			middle = (low + high) // 2
+			middle_value = key(self.data_provider(indices[middle]))
+
+			if (middle_value < value) if self._sort_reverse else (value < middle_value):
+				high = middle
+			else:
+				low = middle + 1
+
+		return low
+
+	def _move_rows(self, position: int, offset: int) -> None:
+		"""
+		Update the selection for an item having been inserted at, or removed from, the given position.
+
+		:param position:
+		:param offset: ``1`` if an item was inserted, or ``-1`` if the item at ``position`` was removed.
+		"""
+
+		def move(idx: int) -> int:
+			if offset < 0 and idx == position:
+				return -1
+			return idx + offset if idx >= position else idx
+
+		self._selected = {move(idx) for idx in self._selected}
+		self._selected.discard(-1)
+
+		for name in self._tracked_rows:
+			idx = getattr(self, name)
+			if idx != -1:
+				setattr(self, name, move(idx))
+
+	def Clear(self) -> bool:
+		"""
+		Removes all items from the control.
+		"""
+
+		if self._data is not None:
+			self._data.clear()
+
+		self.SetItemCount(0)
+
+		event = wx.ListEvent(wx.wxEVT_LIST_DELETE_ALL_ITEMS)
+		event.SetEventObject(self)
+		wx.PostEvent(self, event)
+
+		return True
+
+	def DeleteItem(self, item: Union[int, PanelListItem]) -> bool:
+		"""
+		Deletes the specified item from the control.
+
+		:param item: The index of the item.
+
+		:return: :py:obj:`True` if the item was removed, :py:obj:`False` otherwise
+			(usually because the item wasn't in the control)
+		"""
+
+		data = self._get_data()
+
+		if isinstance(item, PanelListItem):
+			item = self.GetItemPosition(item)
+
+		if not 0 <= item < self._item_count:
+			return False
+
+		data_idx = self.GetDataIndex(item)
+		del data[data_idx]
+		self._data_count -= 1
+		self._type_ahead_index = None
+
+		# The later items in the data_provider move up
+		if self._sorted_indices is not None:
+			self._sorted_indices = [idx - (idx > data_idx) for idx in self._sorted_indices if idx != data_idx]
+
+		if self._view is not None:
+			del self._view[item]
+			self._view = [idx - (idx > data_idx) for idx in self._view]
+
+		self._item_count -= 1
+		self._move_rows(item, -1)
+
+		if not self._batch_depth:
+			self._do_layout()
+
+		event = wx.ListEvent(wx.wxEVT_LIST_DELETE_ITEM)
+		event.SetEventObject(self)
+		wx.PostEvent(self, event)
+
+		return True
+
+	def Focus(self, idx: int) -> None:
+		"""
+		Set Focus to the the given item.
+
+		:param idx:
+		"""
+
+		self.SetSelection(idx)
+		self.EnsureVisible(idx)
+
+	def GetFirstSelected(self, *_) -> int:  # noqa: PRM002
+		"""
+		Returns the index of the first selected item, or -1 when none is selected.
+		"""
+
+		return min(self._selected, default=-1)
+
+	def GetFocusedItem(self) -> int:
+		"""
+		Gets the index of the currently focused item or -1 if none is focused.
+		"""
+
+		return self.GetFirstSelected()
+
+	def GetItem(self, itemIdx: int, *_) -> PanelListItem:  # noqa: PRM002
+		"""
+		Returns the :class:`~.PanelListItem` displaying the item at the given index.
+
+		The control is scrolled to make the item visible if necessary.
+
+		The :class:`~.PanelListItem` is reused for a different item when it is scrolled out of view.
+
+		:param itemIdx:
+		"""
+
+		if not 0 <= itemIdx < self._item_count:
+			raise IndexError("list index out of range")
+
+		if itemIdx not in self._visible:
+			self.EnsureVisible(itemIdx)
+
+		return self._visible[itemIdx]
+
+	def GetItemCount(self) -> int:
+		"""
+		Returns the number of items in the list control.
+		"""
+
+		return self._item_count
+
+	def GetItemPosition(self, item) -> int:
+		"""
+		Returns the index of the item displayed by the given :class:`~.PanelListItem`.
+
+		If it is not displaying an item ``-1`` is returned.
+
+		:param item:
+		"""
+
+		for index, visible_item in self._visible.items():
+			if visible_item is item:
+				return index
+
+		return -1
+
+	def GetNextSelected(self, item: int) -> int:
+		"""
+		Returns the index of the next selected item after the given index, or -1 when no more are selected.
+
+		:param item:
+		"""
+
+		return min((idx for idx in self._selected if idx > item), default=-1)
+
+	def GetSelectedItemCount(self) -> int:
+		"""
+		Returns the number of selected items in the list control.
+		"""
+
+		return len(self._selected)
+
+	def IsEmpty(self) -> bool:
+		"""
+		Returns true if the control doesn't currently contain any items.
+		"""
+
+		return not self._item_count
+
+	def IsSelected(self, idx: int) -> bool:
+		"""
+		Returns ``:py:obj:`True``` if the item is selected.
+
+		:param idx:
+		"""
+
+		return idx in self._selected
+
+	def RefreshItems(self, itemFrom: int, itemTo: int) -> None:
+		"""
+		Fetch the text for the items between itemFrom and itemTo from the ``data_provider``, and redraw them.
+
+		:param itemFrom:
+		:param itemTo:
+		"""
+
+		self._type_ahead_index = None
+
+		for index, item in self._visible.items():
+			if itemFrom <= index <= itemTo:
+				item.SetTextDict(self._get_text_dict(index))
+
+		self._update_rows()
+
+	def RefreshItem(self, item: Union[int, PanelListItem]) -> None:
+		"""
+		Fetch the text for the given item from the ``data_provider``, and redraw it.
+
+		:param item: The index of the item.
+		"""
+
+		if isinstance(item, PanelListItem):
+			item = self.GetItemPosition(item)
+
+		self.RefreshItems(item, item)
+
+
+class OwnerDrawnPanelListCtrl(VirtualPanelListCtrl):
+	"""
+	A :class:`~.VirtualPanelListCtrl` which draws the items itself rather than using a :class:`~.PanelListItem` for each row.
+
+	The rows are drawn with the colours and fonts from the stylesheet, in the same layout as
+	a :class:`~.PanelListItem`, with text which is too wide shortened in the middle.
+	Only the rows in the area which needs to be redrawn are painted, and text measurements are cached.
+
+	Methods such as :meth:`~.OwnerDrawnPanelListCtrl.GetFirstSelected` return the index of the item,
+	and the events sent by the control have the index of the item set.
+	There are no :class:`~.PanelListItem` objects, so the ``text_dict`` of an item is obtained with
+	:meth:`~.OwnerDrawnPanelListCtrl.GetItemTextDict` rather than :meth:`~.OwnerDrawnPanelListCtrl.GetItem`.
+
+	:param parent: The parent window.
+	:param data_provider: Function which returns the ``text_dict`` for the item at the given index.
+		If :py:obj:`None` the control stores the items itself.
+	:param style_data: The style data for the items. See :class:`~.PanelListItem`.
+	:param item_count: The initial number of items.
+	:param id: An identifier for the control. ID_ANY is taken to mean a default.
+	:param pos: The control position.
+	:param size: The control size.
+	:param style: The window style. See :class:`wx.ScrolledWindow`.
+	:param name: Window name.
+	:param left_padding: The spacing to the left of the text in each item.
+	:param multiple_selection: Whether Shift and Ctrl may be used to select more than one item.
+	"""
+
+	#: The maximum number of text measurements to cache.
+	measurement_cache_size: int = 4096
+
+	# The index of the item with the keyboard focus.
+	# A class attribute as VirtualPanelListCtrl.__init__ calls SetItemCount.
+	_focused: int = -1
+
+	_tracked_rows = ("_anchor", "_focused")
+
+	def __init__(
+			self,
+			parent: wx.Window,
+			data_provider: Optional[Callable[[int], Dict[str, str]]],
+			style_data,
+			item_count: int = 0,
+			id: int = wx.ID_ANY,  # noqa: A002  # pylint: disable=redefined-builtin
+			pos: Tuple[int, int] = wx.DefaultPosition,
+			size: Tuple[int, int] = wx.DefaultSize,
+			style: int = wx.TAB_TRAVERSAL,
+			name: bytes = wx.PanelNameStr,
+			left_padding=32,
+			multiple_selection: bool = True,
+			):
+
+		VirtualPanelListCtrl.__init__(
+				self,
+				parent,
+				data_provider,
+				style_data,
+				0,
+				id,
+				pos,
+				size,
+				style | wx.WANTS_CHARS,
+				name,
+				left_padding,
+				multiple_selection,
+				)
+
+		self._line_heights: Dict[str, int] = {}
+		self._brushes: Dict[bool, wx.Brush] = {}
+		self._text_widths: "OrderedDict[Tuple[str, bool, str], int]" = OrderedDict()
+		self._fitted_text: "OrderedDict[Tuple[str, bool, str, int], str]" = OrderedDict()
+
+		self.SetBackgroundStyle(wx.BG_STYLE_PAINT)
+
+		self.Bind(wx.EVT_PAINT, self._on_paint)
+		self.Bind(wx.EVT_LEFT_UP, self._on_left_up)
+		self.Bind(wx.EVT_LEFT_DCLICK, self._on_double_click)
+		self.Bind(wx.EVT_RIGHT_UP, self._on_right_click)
+		self.Bind(wx.EVT_MIDDLE_UP, self._on_right_click)
+		self.Bind(wx.EVT_KEY_DOWN, self._on_char_key_down)
+		self.Bind(wx.EVT_CHAR, self._on_char)
+		self.Bind(wx.EVT_SET_FOCUS, self._on_focus_changed)
+		self.Bind(wx.EVT_KILL_FOCUS, self._on_focus_changed)
+
+		self.SetItemCount(item_count)
+
+	def AcceptsFocusFromKeyboard(self) -> bool:
+		return True
+
+	# Layout
+
+	def _get_row_height(self) -> int:
+		line_heights = [self._get_line_height(css_class) for css_class in self._get_text_dict(0)]
+		return _ROW_TOP + sum(line_heights) + _LINE_GAP * (len(line_heights) - 1) + _ROW_BOTTOM
+
+	def _get_line_height(self, css_class: str) -> int:
+		"""
+		Returns the height of a line of text with the given css class, selected or not.
+
+		:param css_class:
+		"""
+
+		if css_class not in self._line_heights:
+			self._line_heights[css_class] = max(
+					self.GetFullTextExtent("Ag", self.style_data.text_style(css_class, selected).font)[1]
+					for selected in (False, True)
+					)
+
+		return self._line_heights[css_class]
+
+	def _get_row_rect(self, index: int) -> wx.Rect:
+		"""
+		Returns the rectangle occupied by the row at the given index, in client coordinates.
+
+		:param index:
+		"""
+
+		x, y = self.CalcScrolledPosition(0, index * self._row_height)
+		return wx.Rect(x, y, self.GetClientSize().width, self._row_height)
+
+	def _update_rows(self) -> None:
+		# Scrolling repaints the newly visible area, and resizing repaints the whole control.
+		pass
+
+	def _do_layout(self) -> None:
+		self._update_virtual_size()
+
+		# Any of the rows may have changed, and those below the last row need clearing, so redraw everything once.
+		self._type_ahead_index = None
+		self.Refresh()
+
+	def _on_view_changed(self, event: wx.Event) -> None:  # noqa: PRM002
+		"""
+		Handler for the control being resized or scrolled.
+		"""
+
+		event.Skip()
+
+		if event.GetEventType() == wx.wxEVT_SIZE:
+			# The text may need to be shortened differently
+			self.Refresh()
+
+	def _refresh_rows(self, indices: Container[int]) -> None:
+		"""
+		Mark the visible rows at the given indices as needing to be redrawn.
+
+		One rectangle covering all of those rows is redrawn, so this is quick however many indices are given.
+
+		:param indices:
+		"""
+
+		if not self._row_height:
+			return
+
+		first, last = self._get_visible_rows()
+		damaged = [index for index in range(first, last) if index in indices]
+
+		if damaged:
+			self.RefreshRect(self._get_row_rect(damaged[0]).Union(self._get_row_rect(damaged[-1])))
+
+	def _refresh_selection(self, changed: Set[int]) -> None:
+		self._refresh_rows(changed)
+
+	def _focus_row(self, idx: int) -> None:
+		previous, self._focused = self._focused, idx
+		self.EnsureVisible(idx)
+		self._refresh_rows({previous, idx})
+		self.SetFocus()
+
+	# Painting
+
+	def _on_paint(self, event: wx.Event) -> None:  # noqa: PRM002
+		"""
+		Handler for EVT_PAINT. Draws the rows which intersect the area to be redrawn.
+		"""
+
+		dc = wx.AutoBufferedPaintDC(self)
+		self.DoPrepareDC(dc)
+
+		update = self.GetUpdateRegion().GetBox()
+		left, top = self.CalcUnscrolledPosition(update.x, update.y)
+		width = self.GetClientSize().width
+
+		dc.SetPen(wx.TRANSPARENT_PEN)
+		dc.SetBrush(wx.Brush(self.GetBackgroundColour()))
+		dc.DrawRectangle(left, top, update.width, update.height)
+
+		if not self._row_height:
+			return
+
+		first = top // self._row_height
+		last = min((top + update.height) // self._row_height + 1, self._item_count)
+
+		for index in range(first, last):
+			self._draw_row(dc, index, width)
+
+	def _draw_row(self, dc: wx.DC, index: int, width: int) -> None:
+		"""
+		Draw the row at the given index.
+
+		:param dc: The device context to draw on, prepared for the scroll position.
+		:param index:
+		:param width: The width of the row.
+		"""
+
+		selected = index in self._selected
+		row_top = index * self._row_height
+
+		dc.SetPen(wx.TRANSPARENT_PEN)
+		dc.SetBrush(self._get_background_brush(selected))
+		dc.DrawRectangle(0, row_top, width, self._row_height)
+
+		x = self.left_padding
+		y = row_top + _ROW_TOP
+
+		for css_class, text in self._get_text_dict(index).items():
+			text_style = self.style_data.text_style(css_class, selected)
+			dc.SetFont(text_style.font)
+			dc.SetTextForeground(text_style.colour)
+			dc.DrawText(self._fit_text(dc, css_class, selected, text, width - x), x, y)
+
+			y += self._get_line_height(css_class) + _LINE_GAP
+
+		if index == self._focused and self.HasFocus():
+			wx.RendererNative.Get().DrawFocusRect(self, dc, wx.Rect(0, row_top, width, self._row_height))
+
+	def _get_background_brush(self, selected: bool) -> wx.Brush:
+		"""
+		Returns the brush for the background of a row.
+
+		:param selected: Whether the row is selected.
+		"""
+
+		if selected not in self._brushes:
+			colour = self.style_data.background_colour(selected)
+
+			if colour is None and selected:
+				colour = wx.SystemSettings.GetColour(wx.SYS_COLOUR_MENUHILIGHT)
+			elif colour is None:
+				colour = wx.SystemSettings.GetColour(wx.SYS_COLOUR_LISTBOX)
+
+			self._brushes[selected] = wx.Brush(colour)
+
+		return self._brushes[selected]
+
+	def _fit_text(self, dc: wx.DC, css_class: str, selected: bool, text: str, max_width: int) -> str:
+		"""
+		Returns the text, shortened in the middle if it is wider than ``max_width``.
+
+		:param dc: The device context, with the font for the text selected.
+		:param css_class:
+		:param selected:
+		:param text:
+		:param max_width:
+		"""
+
+		key = (css_class, selected, text)
+
+		if key in self._text_widths:
+			self._text_widths.move_to_end(key)
+			text_width = self._text_widths[key]
+		else:
+			text_width = self._text_widths[key] = dc.GetTextExtent(text).width
+			_trim_cache(self._text_widths, self.measurement_cache_size)
+
+		if text_width <= max_width:
+			return text
+
+		fitted_key = (*key, max_width)
+
+		if fitted_key in self._fitted_text:
+			self._fitted_text.move_to_end(fitted_key)
+			return self._fitted_text[fitted_key]
+
+		fitted = self._fitted_text[fitted_key] = wx.Control.Ellipsize(text, dc, wx.ELLIPSIZE_MIDDLE, max_width)
+		_trim_cache(self._fitted_text, self.measurement_cache_size)
+
+		return fitted
+
+	# Input
+
+	def HitTest(self, point: Union[wx.Point, Tuple[int, int]]) -> Tuple[int, int]:
+		"""
+		Determines which item (if any) is at the specified point.
+
+		:param point: The point, in client coordinates.
+
+		:return: The index of the item, or ``-1`` if there is no item at the point,
+			and :py:obj:`wx.LIST_HITTEST_ONITEM` or :py:obj:`wx.LIST_HITTEST_NOWHERE`.
+		"""
+
+		y = self.CalcUnscrolledPosition(*point)[1]
+
+		if self._row_height and 0 <= y < self._item_count * self._row_height:
+			return y // self._row_height, wx.LIST_HITTEST_ONITEM
+
+		return -1, wx.LIST_HITTEST_NOWHERE
+
+	def _post_list_event(self, event_type: int, index: int, key_code: Optional[int] = None) -> None:
+		"""
+		Send a list event for the item at the given index to the control and its parents.
+
+		:param event_type:
+		:param index:
+		:param key_code: The key code for ``EVT_LIST_KEY_DOWN`` events.
+		"""
+
+		event = wx.ListEvent(event_type, self.GetId())
+		event.SetEventObject(self)
+		event.SetIndex(index)
+
+		if key_code is not None:
+			event.SetKeyCode(key_code)
+
+		wx.PostEvent(self, event)
+
+	def _on_left_up(self, event: wx.MouseEvent) -> None:  # noqa: PRM002
+		"""
+		Handler for EVT_LEFT_UP. Selects the item which was clicked.
+		"""
+
+		index = self.HitTest(event.GetPosition())[0]
+
+		if index != -1:
+			self._click(index, event.GetModifiers())
+			self._post_list_event(wx.wxEVT_LIST_ITEM_SELECTED, index)
+
+		event.Skip()
+
+	def _on_double_click(self, event: wx.MouseEvent) -> None:  # noqa: PRM002
+		"""
+		Handler for EVT_LEFT_DCLICK.
+		"""
+
+		index = self.HitTest(event.GetPosition())[0]
+
+		if index != -1:
+			self._post_list_event(wx.wxEVT_LIST_ITEM_ACTIVATED, index)
+
+		event.Skip()
+
+	def _on_right_click(self, event: wx.MouseEvent) -> None:  # noqa: PRM002
+		"""
+		Handler for EVT_RIGHT_UP and EVT_MIDDLE_UP.
+		"""
+
+		index = self.HitTest(event.GetPosition())[0]
+
+		if index != -1:
+			self._post_list_event(wx.wxEVT_LIST_ITEM_RIGHT_CLICK, index)
+
+		event.Skip()
+
+	def _on_char_key_down(self, event: wx.KeyEvent) -> None:  # noqa: PRM002
+		"""
+		Handler for EVT_KEY_DOWN. Moves the selection from the focused item.
+		"""
+
+		if self._item_count:
+			index = max(self._focused, 0)
+			self._key_down(index, event.GetKeyCode(), event.GetModifiers())
+			self._post_list_event(wx.wxEVT_LIST_KEY_DOWN, self._focused, event.GetKeyCode())
+
+		event.Skip()
+
+	def _on_char(self, event: wx.KeyEvent) -> None:  # noqa: PRM002
+		"""
+		Handler for EVT_CHAR. Selects the next item whose text starts with the characters typed.
+		"""
+
+		if self._item_count and self._char(max(self._focused, 0), event.GetUnicodeKey(), event.GetModifiers()):
+			return
+
+		event.Skip()
+
+	def _on_focus_changed(self, event: wx.FocusEvent) -> None:  # noqa: PRM002
+		"""
+		Handler for EVT_SET_FOCUS and EVT_KILL_FOCUS. Redraws the focus rectangle.
+		"""
+
+		self._refresh_rows({self._focused})
+		event.Skip()
+
+	# ListCtrl-style methods
+
+	def GetFocusedItem(self) -> int:
+		"""
+		Gets the index of the currently focused item or -1 if none is focused.
+		"""
+
+		return self._focused
+
+	def GetItem(self, itemIdx: int, *_) -> PanelListItem:  # noqa: PRM002
+		"""
+		Not supported, as the control does not use :class:`~.PanelListItem` objects.
+
+		Use :meth:`~.OwnerDrawnPanelListCtrl.GetItemTextDict` instead.
+
+		:param itemIdx:
+		"""
+
+		raise TypeError(f"{type(self).__name__} does not support GetItem. Use GetItemTextDict instead.")
+
+	def GetItemTextDict(self, itemIdx: int) -> Dict[str, str]:
+		"""
+		Returns the ``text_dict`` of the item at the given index.
+
+		:param itemIdx:
+		"""
+
+		if not 0 <= itemIdx < self._item_count:
+			raise IndexError("list index out of range")
+
+		return self._get_text_dict(itemIdx)
+
+	def GetItemPosition(self, item) -> int:  # noqa: D102
+		return -1
+
+	def RefreshItems(self, itemFrom: int, itemTo: int) -> None:
+		"""
+		Redraw the items between itemFrom and itemTo, fetching their text from the ``data_provider``.
+
+		:param itemFrom:
+		:param itemTo:
+		"""
+
+		self._type_ahead_index = None
+		self._refresh_rows(range(max(itemFrom, 0), min(itemTo + 1, self._item_count)))
+
+	def RefreshItem(self, item: int) -> None:
+		"""
+		Redraw the given item, fetching its text from the ``data_provider``.
+
+		:param item: The index of the item.
+		"""
+
+		self.RefreshItems(item, item)
+
+
+# The keys which move the selection
+_NAVIGATION_KEYS = {wx.WXK_UP, wx.WXK_DOWN, wx.WXK_PAGEUP, wx.WXK_PAGEDOWN}
+
+# Spacing around the text in each row, matching the layout of PanelListItem
+_ROW_TOP = 6
+_ROW_BOTTOM = 4
+_LINE_GAP = 0 if wx.Platform == "__WXGTK__" else 2
+
+
+def _trim_cache(cache: OrderedDict, maxsize: int) -> None:
+	"""
+	Discard the least recently used entries from the cache until it is no larger than ``maxsize``.
+
+	:param cache:
+	:param maxsize:
+	"""
+
+	while len(cache) > maxsize:
+		cache.popitem(last=False)
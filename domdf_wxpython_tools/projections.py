@@ -25,16 +25,231 @@
 #
 
 # stdlib
-from typing import Optional
+import time
+import weakref
+from typing import Any, Dict, Optional, Tuple
 
 # 3rd party
 import matplotlib
+import numpy
+import wx  # type: ignore[import-not-found]
 from matplotlib.backend_bases import MouseButton
+from matplotlib.lines import Line2D
 
-__all__ = ["XPanAxes", "XPanAxes_NoZoom", "NoZoom"]
+# this package
+from domdf_wxpython_tools.chart_data import MinMaxPyramid
 
+__all__ = ["PreviewPanMixin", "XPanAxes", "XPanAxes_NoZoom", "NoZoom"]
 
-class XPanAxes(matplotlib.axes.Axes):
+
+class PreviewPanMixin:
+	"""
+	Mixin for :class:`matplotlib.axes.Axes` which makes panning faster by drawing less while the mouse button is held.
+
+	When :attr:`~.PreviewPanMixin.fast_pan` is :py:obj:`True`:
+
+	* the view is moved at most once every :attr:`~.PreviewPanMixin.pan_interval` seconds,
+	  however often the mouse moves, and catches up with the mouse once it stops;
+	* lines with more than :attr:`~.PreviewPanMixin.preview_points` points are drawn with only the smallest and largest
+	  point in each of a number of buckets, using a :class:`~.MinMaxPyramid`, so peaks are not lost.
+	  The buckets cover the view and one view width either side of it, and are recalculated if the view moves further.
+	  Lines whose x values are not numeric and in ascending order are drawn in full.
+
+	The full data is restored, and the view moved to where the mouse was released, when panning ends.
+	"""
+
+	#: Whether to throttle panning and show a low-detail preview while the mouse button is held.
+	fast_pan: bool = False
+
+	#: The minimum time, in seconds, between moving the view while panning.
+	pan_interval: float = 1 / 30
+
+	#: The maximum number of points each line shows while panning. If :py:obj:`None` all points are shown.
+	preview_points: Optional[int] = 5000
+
+	def __init__(self, *args, **kwargs):
+		super().__init__(*args, **kwargs)
+
+		# The MinMaxPyramid for each line, and the x data it was made from.
+		self._pyramids: "weakref.WeakKeyDictionary[Line2D, Tuple[Any, Optional[MinMaxPyramid]]]"
+		self._pyramids = weakref.WeakKeyDictionary()
+
+	def __getstate__(self) -> Dict[str, Any]:
+		# Axes.__getstate__ handles shared axes, so the state can't just be taken from __dict__.
+		state: Dict[str, Any] = getattr(super(), "__getstate__")()
+
+		# The pyramids are rebuilt when needed, and the state of a pan in progress isn't kept.
+		for name in ("_pyramids", "_pan_timer", "_pending_pan", "_full_data", "_preview_x"):
+			state.pop(name, None)
+
+		return state
+
+	def __setstate__(self, state: Dict[str, Any]) -> None:
+		super().__setstate__(state)  # type: ignore[misc]
+		self._pyramids = weakref.WeakKeyDictionary()
+
+	def start_pan(self, x: float, y: float, button: MouseButton) -> None:
+		"""
+		Called when a pan operation has started.
+
+		:param x: The mouse coordinates in display coords.
+		:param y: The mouse coordinates in display coords.
+		:param button: The pressed mouse button.
+		"""
+
+		super().start_pan(x, y, button)  # type: ignore[misc]
+
+		self._last_pan = 0.0
+		self._pending_pan: Optional[Tuple[MouseButton, Optional[str], float, float]] = None
+		self._pan_timer: Optional[wx.CallLater] = None
+
+		# The full data of each line showing a preview, the x data of the preview, and the x-range the previews cover.
+		self._full_data: Dict[Line2D, Tuple[Any, Any, MinMaxPyramid]] = {}
+		self._preview_x: Dict[Line2D, Any] = {}
+		self._preview_range = (0.0, 0.0)
+
+		if self.fast_pan and self.preview_points:
+			self._max_preview_points = self.preview_points
+
+			for line in self.lines:  # type: ignore[attr-defined]
+				x_data, y_data = line.get_xdata(orig=True), line.get_ydata(orig=True)
+
+				if len(x_data) > self.preview_points:
+					pyramid = self._get_pyramid(line, x_data, y_data)
+					if pyramid is not None:
+						self._full_data[line] = (x_data, y_data, pyramid)
+
+			self._update_previews()
+
+	def _update_previews(self) -> None:
+		"""
+		Resample the previews if the view has moved outside the x-range they cover.
+
+		Each preview covers the view and one view width either side of it,
+		so it only needs resampling after the view has moved by a whole width.
+		"""
+
+		if not self._full_data:
+			return
+
+		x_min, x_max = sorted(self.get_xlim())  # type: ignore[attr-defined]
+		if self._preview_range[0] <= x_min and x_max <= self._preview_range[1]:
+			return
+
+		width = x_max - x_min
+		self._preview_range = (x_min - width, x_max + width)
+
+		for line, (x_data, y_data, pyramid) in self._full_data.items():
+			if line in self._preview_x and line.get_xdata(orig=True) is not self._preview_x[line]:
+				# The line's data was replaced during the pan.
+				continue
+
+			# The pyramid returns at least this many buckets, but fewer than ``factor`` times as many.
+			n_buckets = max(self._max_preview_points // (2 * pyramid.factor), 1)
+			line.set_data(*pyramid.resample(*self._preview_range, n_buckets))
+			self._preview_x[line] = line.get_xdata(orig=True)
+
+	def _get_pyramid(self, line: Line2D, x_data: Any, y_data: Any) -> Optional[MinMaxPyramid]:
+		"""
+		Returns the :class:`~.MinMaxPyramid` for the line's data, or :py:obj:`None` if it cannot have one.
+
+		The pyramid is kept for the next pan, for as long as the line's data is not replaced.
+
+		:param line:
+		:param x_data:
+		:param y_data:
+		"""
+
+		if line in self._pyramids and self._pyramids[line][0] is x_data:
+			return self._pyramids[line][1]
+
+		x_array = numpy.asarray(x_data)
+		y_array = numpy.asarray(y_data)
+		pyramid = None
+
+		if (
+				x_array.dtype.kind in "iuf" and y_array.dtype.kind in "iuf" and x_array.shape == y_array.shape
+				and not (numpy.diff(x_array) < 0).any()
+				):
+			pyramid = MinMaxPyramid(x_array, y_array)
+
+		self._pyramids[line] = (x_data, pyramid)
+		return pyramid
+
+	def _preview_drag_pan(self, button: MouseButton, key: Optional[str], x: float, y: float) -> None:
+		"""
+		Move the view, unless it was moved within the last :attr:`~.PreviewPanMixin.pan_interval` seconds.
+
+		:param button: The pressed mouse button.
+		:param key: The pressed key, if any.
+		:param x: The mouse coordinates in display coords.
+		:param y: The mouse coordinates in display coords.
+		"""
+
+		if self.fast_pan:
+			now = time.perf_counter()
+
+			if now - self._last_pan < self.pan_interval:
+				# The view is always moved relative to where the pan started,
+				# so skipped events only need the latest one remembering.
+				self._pending_pan = (button, key, x, y)
+
+				# Catch up with the mouse if it stops moving.
+				if self._pan_timer is None or not self._pan_timer.IsRunning():
+					delay = (self.pan_interval - (now - self._last_pan)) * 1000
+					self._pan_timer = wx.CallLater(max(int(delay), 1), self._flush_pending_pan)
+
+				return
+
+			self._last_pan = now
+
+		self._pending_pan = None
+		super().drag_pan(button, key, x, y)  # type: ignore[misc]
+		self._update_previews()
+
+	def _flush_pending_pan(self) -> None:
+		"""
+		Move the view to the position of the last skipped mouse movement, and redraw.
+		"""
+
+		if self._pending_pan is None or not hasattr(self, "_pan_start"):
+			# The pan has ended
+			return
+
+		self._last_pan = time.perf_counter()
+		super().drag_pan(*self._pending_pan)  # type: ignore[misc]
+		self._pending_pan = None
+		self._update_previews()
+		self.figure.canvas.draw_idle()  # type: ignore[attr-defined]
+
+	def end_pan(self) -> None:
+		"""
+		Called when a pan operation completes.
+		"""
+
+		if self._pan_timer is not None:
+			self._pan_timer.Stop()
+			self._pan_timer = None
+
+		if self._pending_pan is not None:
+			super().drag_pan(*self._pending_pan)  # type: ignore[misc]
+			self._pending_pan = None
+
+		for line, (x_data, y_data, pyramid) in self._full_data.items():
+			# Leave alone lines whose data was replaced during the pan.
+			if line.get_xdata(orig=True) is self._preview_x[line]:
+				line.set_data(x_data, y_data)
+
+				# Line2D keeps a copy of the data, so the pyramid is kept with that.
+				self._pyramids[line] = (line.get_xdata(orig=True), pyramid)
+
+		self._full_data = {}
+		self._preview_x = {}
+
+		super().end_pan()  # type: ignore[misc]
+
+
+class XPanAxes(PreviewPanMixin, matplotlib.axes.Axes):
 	"""
 	Constrain pan to x-axis.
 	"""
@@ -51,10 +266,10 @@ class XPanAxes(matplotlib.axes.Axes):
 		"""
 
 		# pretend key=='x'
-		matplotlib.axes.Axes.drag_pan(self, button, 'x', x, y)
+		self._preview_drag_pan(button, 'x', x, y)
 
 
-class XPanAxes_NoZoom(matplotlib.axes.Axes):
+class XPanAxes_NoZoom(PreviewPanMixin, matplotlib.axes.Axes):
 	"""
 	Constrain pan to x-axis and prevent zooming.
 	"""
@@ -74,10 +289,10 @@ class XPanAxes_NoZoom(matplotlib.axes.Axes):
 		if button != 1:
 			return
 
-		matplotlib.axes.Axes.drag_pan(self, button, 'x', x, y)
+		self._preview_drag_pan(button, 'x', x, y)
 
 
-class NoZoom(matplotlib.axes.Axes):
+class NoZoom(PreviewPanMixin, matplotlib.axes.Axes):
 	"""
 	Prevent zooming in pan mode.
 	"""
@@ -96,7 +311,7 @@ class NoZoom(matplotlib.axes.Axes):
 		# pretend key=='x'
 		if button != 1:
 			return
-		matplotlib.axes.Axes.drag_pan(self, button, key, x, y)
+		self._preview_drag_pan(button, key, x, y)
 
 
 #